@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .diskcache import DiskCache
+
+
+CacheKey = Tuple[Hashable, ...]
+
+# First matching pattern wins; endpoints are matched without the leading slash or query string.
+DEFAULT_TTL_RULES: Tuple[Tuple[str, str], ...] = (
+    (r"^(movie|tv)/\d+$", "detail"),
+    (r"^request/\d+$", "request"),
+    (r"^search$", "search"),
+)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # When to re-read the shared backend, in case another process changed or invalidated it
+    recheck_at: float = math.inf
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry once it expires."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    return endpoint.strip().strip("/").lower()
+
+
+def make_key(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None))
+    return (method.upper(), normalize_endpoint(endpoint), items)
+
+
+class ResponseCache:
+    """In-process TTL + LRU cache for idempotent upstream responses.
+
+    Values are returned as stored, so callers must treat them as read-only. With a
+    `backend`, `load()` reads misses from it and writes and invalidations are mirrored to it.
+    Other processes share that backend, so memory entries are only trusted for `memory_ttl`
+    seconds; after that `get()` misses and the caller should `load()` the backend's copy.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        default_ttl: float = 30.0,
+        ttls: Optional[Dict[str, float]] = None,
+        rules: Sequence[Tuple[str, str]] = DEFAULT_TTL_RULES,
+        clock: Callable[[], float] = time.monotonic,
+        backend: Optional["DiskCache"] = None,
+        memory_ttl: float = 5.0,
+    ):
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._max_entries = max_entries
+        self._default_ttl = default_ttl
+        self._ttls = dict(ttls or {})
+        self._rules = [(re.compile(pattern), name) for pattern, name in rules]
+        self._clock = clock
+        self._backend = backend
+        self._memory_ttl = memory_ttl if backend is not None else math.inf
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, endpoint: str) -> float:
+        endpoint = normalize_endpoint(endpoint)
+        for pattern, name in self._rules:
+            if pattern.match(endpoint):
+                return self._ttls.get(name, self._default_ttl)
+        return self._default_ttl
+
+    def get(self, key: CacheKey, default: Any = None) -> Any:
+        """Return the cached value, or `default` when missing or expired."""
+        entry = self._entries.get(key)
+        now = self._clock()
+        if entry is None or entry.expires_at <= now or entry.recheck_at <= now:
+            self.misses += 1
+            # Expired entries are only worth keeping if they can be revalidated
+            if entry is not None and entry.expires_at <= now and not entry.validators():
+                del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def get_stale(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Return the entry regardless of expiry, for conditional revalidation."""
+        return self._entries.get(key)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.expires_at > self._clock()
+
+    def needs_load(self, entry: Optional[CacheEntry]) -> bool:
+        """Whether the backend should be read before using (or revalidating) `entry`."""
+        return self._backend is not None and (entry is None or entry.recheck_at <= self._clock())
+
+    async def load(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Read `key` from the backend into memory; returns the entry, expired or not.
+
+        If the backend no longer has it (another process invalidated it), the memory copy goes too.
+        """
+        if self._backend is None:
+            return None
+        stored = await self._backend.get(key)
+        if stored is None:
+            self._entries.pop(key, None)
+            return None
+        value, remaining, etag, last_modified = stored
+        now = self._clock()
+        entry = CacheEntry(value, now + remaining, etag, last_modified, now + self._memory_ttl)
+        self._store(key, entry)
+        return entry
+
+    def set(
+        self,
+        key: CacheKey,
+        value: Any,
+        ttl: float,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        if ttl <= 0 or self._max_entries <= 0:
+            return
+        now = self._clock()
+        self._store(key, CacheEntry(value, now + ttl, etag, last_modified, now + self._memory_ttl))
+        if self._backend is not None:
+            self._backend.set(key, value, ttl, etag=etag, last_modified=last_modified)
+
+    def _store(self, key: CacheKey, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def refresh(self, key: CacheKey, ttl: float) -> None:
+        """Extend an entry's lifetime after the upstream answered 304 Not Modified."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.expires_at = self._clock() + ttl
+        entry.recheck_at = self._clock() + self._memory_ttl
+        self._entries.move_to_end(key)
+        self.revalidations += 1
+        if self._backend is not None:
+            self._backend.refresh(key, ttl)
+
+    def invalidate(self, prefix: str) -> int:
+        """Drop every entry for `prefix` and the endpoints below it; returns the number removed."""
+        prefix = normalize_endpoint(prefix)
+        stale = [key for key in self._entries if key[1] == prefix or str(key[1]).startswith(prefix + "/")]
+        for key in stale:
+            del self._entries[key]
+        if self._backend is not None:
+            self._backend.invalidate(prefix)
+        return len(stale)
+
+    def invalidate_key(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        if self._backend is not None:
+            self._backend.invalidate_key(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self._backend is not None:
+            self._backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "revalidations": self.revalidations,
+        }
+        if self._backend is not None:
+            stats["disk"] = self._backend.stats()
+        return stats
@@ -1,13 +1,95 @@
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import logging
+import math
+import sqlite3
+import time
+
 import httpx
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
 from urllib.parse import quote_plus
 
+from .cache import CacheKey, ResponseCache, make_key, normalize_endpoint
+from .concurrency import FairScheduler, HedgeBudget, LatencyTracker, Progress, SingleFlight, TokenBucket, run_bounded
 from .config import AppConfig
+from .diskcache import DiskCache
+from .jsoncodec import loads
+from .resilience import (
+    IDEMPOTENT_METHODS,
+    AdmissionController,
+    CircuitBreaker,
+    CircuitOpenError,
+    OverloadedError,
+    RetryPolicy,
+    is_upstream_failure,
+)
+from .services import ServiceRegistry
+
+logger = logging.getLogger("jellyseerr_mcp.client")
+
+_MISSING = object()
+
+# Jellyseerr proxies TMDB search, which always pages by 20
+SEARCH_PAGE_SIZE = 20
+# Most results one search returns; TMDB itself refuses pages past 500
+SEARCH_MAX_RESULTS = 500
+# get_requests: batches this small are always fetched by id; larger ones may scan the request list
+REQUEST_BATCH_BY_ID_MAX = 5
+REQUEST_SCAN_PAGE_SIZE = 100
+
+# Jellyseerr MediaStatus values that make a new request pointless (partially available TV may still need seasons)
+MEDIA_STATUS_DUPLICATE = {2: "pending", 3: "processing", 5: "available"}
+# MediaRequest statuses that are still open: pending approval, approved
+REQUEST_STATUS_OPEN = {1, 2}
+
+
+def _endpoint_kind(endpoint: str) -> str:
+    return normalize_endpoint(endpoint).split("/")[0]
+
+
+def _existing_request_state(media_info: Any, is_4k: bool) -> Optional[str]:
+    """Why a new request for this title would be a duplicate, or None if it wouldn't."""
+    if not isinstance(media_info, dict):
+        return None
+    state = MEDIA_STATUS_DUPLICATE.get(media_info.get("status4k" if is_4k else "status"))
+    if state is not None:
+        return state
+    for request in media_info.get("requests") or []:
+        if bool(request.get("is4k")) == is_4k and request.get("status") in REQUEST_STATUS_OPEN:
+            return "requested"
+    return None
+
 
+def _contiguous_results(pages: Dict[int, Any]) -> List[Any]:
+    """Results of pages 1..n in order, stopping at the first page that hasn't arrived (or is short)."""
+    results: List[Any] = []
+    page = 1
+    while isinstance(pages.get(page), dict):
+        page_results = pages[page].get("results") or []
+        results.extend(page_results)
+        if len(page_results) < SEARCH_PAGE_SIZE:
+            break
+        page += 1
+    return results
+
+
+def _last_page(pages: Dict[int, Any]) -> Optional[int]:
+    """The last page with results, once page 1's `totalPages` or a short page has shown it."""
+    last = None
+    first = pages.get(1)
+    if isinstance(first, dict) and first.get("totalPages") is not None:
+        last = int(first["totalPages"])
+    for page, data in pages.items():
+        if isinstance(data, dict) and len(data.get("results") or []) < SEARCH_PAGE_SIZE:
+            last = page if last is None else min(last, page)
+    return last
+
+
+class _BaseClient:
+    """Shared configuration and helpers for the sync and async clients."""
 
-class JellyseerrClient:
     def __init__(self, config: AppConfig):
         self._base_url = f"{config.jellyseerr_url}/api/v1"
         self._timeout = config.timeout
@@ -16,9 +98,115 @@ class JellyseerrClient:
             "Accept": "application/json",
             "Content-Type": "application/json",
         }
+        self._limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        self._http2 = config.http2
+        if self._http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("⚠️ JELLYSEERR_HTTP2 is set but the 'h2' package is not installed; falling back to HTTP/1.1.")
+            self._http2 = False
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        return {
+            "headers": self._headers,
+            "timeout": self._timeout,
+            "limits": self._limits,
+            "http2": self._http2,
+        }
+
+    def _url(self, endpoint: str) -> str:
+        return f"{self._base_url}/{endpoint.lstrip('/')}"
+
+    def _acquire_slot(self) -> None:
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool sizing and utilisation, for `ping` and capacity planning."""
+        stats: Dict[str, Any] = {
+            "max_connections": self._limits.max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            "keepalive_expiry": self._limits.keepalive_expiry,
+            "http2": self._http2,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+        }
+        if self._limits.max_connections:
+            stats["utilisation"] = round(self._in_flight / self._limits.max_connections, 3)
+        # httpcore does not expose pool stats publicly; report them when the pool is reachable.
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if isinstance(connections, list):
+            stats["open_connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        return {"pool": self.pool_stats()}
+
+    @staticmethod
+    def _translate_error(e: httpx.HTTPError) -> RuntimeError:
+        if isinstance(e, httpx.HTTPStatusError):
+            detail = e.response.text
+            return RuntimeError(f"Jellyseerr API error for '{e.request.method} {e.request.url}': {e.response.status_code} - {detail}")
+        return RuntimeError(f"Jellyseerr connection error for '{e.request.method} {e.request.url}': {e}")
+
+    @staticmethod
+    def _decode(resp: httpx.Response) -> Any:
+        # Decode straight from bytes with the fastest available codec; empty bodies (e.g. 204) become None
+        return loads(resp.content) if resp.content else None
+
+    @staticmethod
+    def _page_items(data: Any, page_size: int, skip: int) -> "tuple[List[Any], bool]":
+        """Items of one `take`/`skip` list page and whether another page follows it."""
+        if not isinstance(data, dict):
+            return [], False
+        items = data.get("results") or []
+        total = (data.get("pageInfo") or {}).get("results")
+        more = len(items) >= page_size and (total is None or skip + page_size < total)
+        return items, more
+
+    @staticmethod
+    def _search_params(query: str) -> Dict[str, Any]:
+        # URL encode the query to handle spaces and special characters
+        return {"query": quote_plus(query)}
+
+    @staticmethod
+    def _build_request_payload(media_details: Dict[str, Any], media_id: int, media_type: str, is_4k: bool) -> Dict[str, Any]:
+        # Jellyseerr API requests are complex. We need to find the service `id` for the desired quality.
+        # This is a simplified example; a real implementation would need to handle seasons, etc.
+        service_slug = "radarr" if media_type == "movie" else "sonarr"
+        if is_4k:
+            service_slug += "_4k"
+
+        service = next((s for s in media_details.get("services", []) if s.get("slug") == service_slug), None)
+
+        if not service:
+            raise ValueError(f"Could not find a service matching slug '{service_slug}' for media_id {media_id}")
+
+        return {
+            "mediaId": media_details["id"],
+            "mediaType": media_type,
+            "is4k": is_4k,
+            "serverId": service["id"],
+        }
+
+
+class JellyseerrClient(_BaseClient):
+    """Blocking client, kept for scripts and existing callers. The MCP server uses AsyncJellyseerrClient."""
+
+    def __init__(self, config: AppConfig):
+        super().__init__(config)
 
         # Synchronous client
-        self._client = httpx.Client(headers=self._headers, timeout=self._timeout)
+        self._client = httpx.Client(**self._client_kwargs())
 
     def close(self) -> None:
         if self._client is not None:
@@ -32,46 +220,650 @@ class JellyseerrClient:
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
     ) -> Any:
-        url = f"{self._base_url}/{endpoint.lstrip('/')}"
+        self._acquire_slot()
         try:
-            resp = self._client.request(method.upper(), url, params=params or None, json=json or None)
+            resp = self._client.request(method.upper(), self._url(endpoint), params=params or None, json=json or None)
             resp.raise_for_status()
             return resp.json()
-        except httpx.HTTPStatusError as e:
-            detail = e.response.text
-            raise RuntimeError(f"Jellyseerr API error for '{e.request.method} {e.request.url}': {e.response.status_code} - {detail}") from e
-        except httpx.RequestError as e:
-            raise RuntimeError(f"Jellyseerr connection error for '{e.request.method} {e.request.url}': {e}") from e
+        except httpx.HTTPError as e:
+            raise self._translate_error(e) from e
+        finally:
+            self._release_slot()
 
 
     # Convenience methods for common operations
     def search_media(self, query: str, limit: int = 20) -> Any:
-        # URL encode the query to handle spaces and special characters
-        encoded_query = quote_plus(query)
-        return self.request("GET", "search", params={"query": encoded_query})
+        """Search and return up to `limit` results, fetching pages one after another."""
+        params = self._search_params(query)
+        limit = max(1, min(limit, SEARCH_MAX_RESULTS))
+        pages: Dict[int, Any] = {}
+        page = 1
+        while True:
+            pages[page] = self.request("GET", "search", params=params if page == 1 else {**params, "page": page})
+            last_page = _last_page(pages)
+            if not isinstance(pages[page], dict) or len(_contiguous_results(pages)) >= limit:
+                break
+            if last_page is not None and page >= last_page:
+                break
+            page += 1
+
+        first = pages[1]
+        if not isinstance(first, dict):
+            return first
+        return {**first, "results": _contiguous_results(pages)[:limit]}
+
+    def get_media_details(self, media_type: str, media_id: int) -> Any:
+        return self.request("GET", f"{media_type}/{media_id}")
 
     def request_media(self, media_id: int, media_type: str, is_4k: bool = False) -> Any:
         # Discover media details to find the correct media ID to request
-        media_details = self.request("GET", f"{media_type}/{media_id}")
+        media_details = self.get_media_details(media_type, media_id)
+        payload = self._build_request_payload(media_details, media_id, media_type, is_4k)
+        return self.request("POST", "request", json=payload)
 
-        # Jellyseerr API requests are complex. We need to find the service `id` for the desired quality.
-        # This is a simplified example; a real implementation would need to handle seasons, etc.
-        service_slug = "radarr" if media_type == "movie" else "sonarr"
-        if is_4k:
-            service_slug += "_4k"
+    def get_request(self, request_id: int) -> Any:
+        return self.request("GET", f"request/{request_id}")
 
-        service = next((s for s in media_details.get("services", []) if s.get("slug") == service_slug), None)
+    def paginate(self, endpoint: str, params: Optional[Dict[str, Any]] = None, page_size: int = 50) -> Iterator[Any]:
+        """Yield every item of a `take`/`skip` list endpoint (`request`, `media`, `user`, `issue`), one page at a time."""
+        skip = 0
+        while True:
+            data = self.request("GET", endpoint, params={**(params or {}), "take": page_size, "skip": skip})
+            items, more = self._page_items(data, page_size, skip)
+            yield from items
+            if not more:
+                return
+            skip += page_size
 
-        if not service:
-            raise ValueError(f"Could not find a service matching slug '{service_slug}' for media_id {media_id}")
 
-        payload = {
-            "mediaId": media_details["id"],
-            "mediaType": media_type,
-            "is4k": is_4k,
-            "serverId": service["id"],
-        }
-        return self.request("POST", "request", json=payload)
+class AsyncJellyseerrClient(_BaseClient):
+    """Non-blocking client used by the MCP server so many upstream calls can be in flight at once."""
 
-    def get_request(self, request_id: int) -> Any:
-        return self.request("GET", f"request/{request_id}")
+    def __init__(self, config: AppConfig, session_key: Optional[Callable[[], Optional[Hashable]]] = None):
+        super().__init__(config)
+
+        self._client = httpx.AsyncClient(**self._client_kwargs())
+        # Identifies the MCP session the current call belongs to; everything is one session by default
+        self._session_key = session_key or (lambda: "default")
+        self._scheduler = FairScheduler(config.max_connections, config.session_max_in_flight)
+        self._admission = AdmissionController(config.admission_max_latency, config.admission_max_queue)
+        self._inflight = SingleFlight()
+        self._retry = RetryPolicy(
+            max_attempts=config.retry_max_attempts,
+            base_delay=config.retry_backoff_base,
+            max_delay=config.retry_backoff_max,
+        )
+        self._retries = 0
+        self._retry_giveups = 0
+        self._breaker = CircuitBreaker(
+            failure_rate=config.breaker_failure_rate,
+            min_calls=config.breaker_min_calls,
+            window=config.breaker_window,
+            open_seconds=config.breaker_open_seconds,
+        )
+        self._read_bucket = TokenBucket(config.rate_limit_read, config.rate_limit_read_burst, config.rate_limit_max_wait)
+        self._write_bucket = TokenBucket(config.rate_limit_write, config.rate_limit_write_burst, config.rate_limit_max_wait)
+        self._latency = LatencyTracker()
+        self._page_concurrency = max(1, config.page_concurrency)
+        self._services = ServiceRegistry()
+        self._service_refresh_interval = config.service_refresh_interval
+        self.bulk_concurrency = max(1, config.bulk_concurrency)
+        self.duplicates_avoided = 0
+        self._hedge: Optional[HedgeBudget] = None
+        if config.hedge_enabled:
+            self._hedge = HedgeBudget(
+                percentile=config.hedge_percentile,
+                min_delay=config.hedge_min_delay,
+                max_ratio=config.hedge_max_ratio,
+            )
+        self._cache: Optional[ResponseCache] = None
+        self._disk: Optional[DiskCache] = None
+        # Everything known about a title, merged from search hits, detail lookups and request responses
+        self._media: Optional[ResponseCache] = None
+        if config.cache_enabled:
+            self._media = ResponseCache(max_entries=config.cache_max_entries, default_ttl=config.cache_detail_ttl, rules=())
+            if config.cache_path:
+                try:
+                    self._disk = DiskCache(config.cache_path, max_entries=config.cache_disk_max_entries)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"⚠️ Could not open disk cache at {config.cache_path}, caching in memory only: {e}")
+            self._cache = ResponseCache(
+                max_entries=config.cache_max_entries,
+                default_ttl=config.cache_ttl,
+                ttls={
+                    "detail": config.cache_detail_ttl,
+                    "search": config.cache_search_ttl,
+                    "request": config.cache_request_ttl,
+                },
+                backend=self._disk,
+                memory_ttl=config.cache_memory_ttl,
+            )
+
+    async def aclose(self) -> None:
+        await self._services.stop()
+        if self._client is not None:
+            await self._client.aclose()
+        if self._disk is not None:
+            # Waits for queued writes, which may sit behind another process's lock
+            await asyncio.to_thread(self._disk.close)
+
+    async def start(self) -> None:
+        """Resolve Radarr/Sonarr servers in the background and keep them fresh.
+
+        Doesn't wait for the first load, so a hanging Jellyseerr can't hold up serving;
+        calls that need a server id before it finishes load the table inline.
+        """
+        self._services.start(self._fetch_service, self._service_refresh_interval)
+
+    async def refresh_services(self) -> None:
+        await self._services.refresh(self._fetch_service)
+
+    async def _fetch_service(self, endpoint: str) -> Any:
+        return await self.request("GET", endpoint, bypass_cache=True)
+
+    async def _server_id(self, media_type: str, is_4k: bool) -> Optional[int]:
+        if self._services.refreshes == 0 and self._services.failures == 0:
+            # start() was never called, or its first load hasn't finished yet
+            try:
+                await self.refresh_services()
+            except Exception:
+                return None
+        return self._services.resolve(media_type, is_4k)
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        bypass_cache: bool = False,
+        idempotency_key: Optional[str] = None,
+        raw: bool = False,
+    ) -> Any:
+        """Call a Jellyseerr endpoint.
+
+        GETs are cached, coalesced and retried. Other methods are only retried when an
+        `idempotency_key` is given, which is also sent as the `Idempotency-Key` header.
+        With `raw=True`, writes and GETs that skip the cache (it is off or `bypass_cache` is
+        set) return the undecoded JSON text, or None for an empty body; cached GETs still
+        return decoded data, since the cache stores it decoded.
+        """
+        method = method.upper()
+        if method != "GET" or json or (raw and (self._cache is None or bypass_cache)):
+            headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+            retry = method in IDEMPOTENT_METHODS or idempotency_key is not None
+            resp = await self._send(method, endpoint, params=params, json=json, headers=headers, retry=retry)
+            data = (resp.text or None) if raw else self._decode(resp)
+            if self._cache is not None and method != "GET":
+                # A write may change anything under the same resource, e.g. POST request -> request/{id}
+                self._cache.invalidate(_endpoint_kind(endpoint))
+            if method != "GET":
+                self._media_written(endpoint, json)
+            return data
+
+        key = make_key(method, endpoint, params)
+        if self._cache is not None and not bypass_cache:
+            cached = self._cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+        # Identical GETs already in flight share one upstream call
+        return await self._inflight.do(key, lambda: self._fetch(key, endpoint, params, bypass_cache))
+
+    async def _fetch(self, key: CacheKey, endpoint: str, params: Optional[Dict[str, Any]], bypass_cache: bool) -> Any:
+        if self._cache is None:
+            return self._decode(await self._send("GET", endpoint, params=params))
+
+        stale = None if bypass_cache else self._cache.get_stale(key)
+        if not bypass_cache and self._cache.needs_load(stale):
+            # The disk tier is only consulted here, off the hot path and once per coalesced miss;
+            # it may hold another process's newer copy, or nothing if that process invalidated it
+            stale = await self._cache.load(key)
+            if stale is not None and self._cache.is_fresh(stale):
+                return stale.value
+        ttl = self._cache.ttl_for(endpoint)
+        try:
+            resp = await self._send("GET", endpoint, params=params, headers=stale.validators() if stale else None)
+        except (CircuitOpenError, OverloadedError):
+            # Stale data beats no data while the upstream is known to be unhealthy
+            if stale is not None:
+                return stale.value
+            raise
+        if resp.status_code == 304 and stale is not None:
+            self._cache.refresh(key, ttl)
+            return stale.value
+        data = self._decode(resp)
+        self._cache.set(
+            key,
+            data,
+            ttl,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        return data
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        retry: bool = True,
+    ) -> httpx.Response:
+        if method in IDEMPOTENT_METHODS:
+            # Only reads are shed: they are cheap to retry, while writes are what the user explicitly asked for
+            queued = self._scheduler.queued + self._read_bucket.waiting + self._write_bucket.waiting
+            self._admission.check(_endpoint_kind(endpoint), queued)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if method == "GET" and self._hedge is not None:
+                    return await self._hedged_attempt(endpoint, params=params, headers=headers)
+                return await self._attempt(method, endpoint, params=params, json=json, headers=headers)
+            except httpx.HTTPError as e:
+                delay = self._retry.next_delay(attempt, e) if retry else None
+                if delay is None:
+                    if retry and attempt > 1:
+                        self._retry_giveups += 1
+                    raise self._translate_error(e) from e
+            self._retries += 1
+            logger.debug(f"🔁 Retrying {method} {endpoint} in {delay:.2f}s (attempt {attempt + 1}/{self._retry.max_attempts})")
+            await asyncio.sleep(delay)
+
+    async def _hedged_attempt(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """GET that sends a second attempt if the first is slower than the recent percentile latency."""
+        assert self._hedge is not None
+        delay = self._hedge.delay(self._latency, _endpoint_kind(endpoint))
+        if delay is None:
+            return await self._attempt("GET", endpoint, params=params, headers=headers)
+
+        first = asyncio.ensure_future(self._attempt("GET", endpoint, params=params, headers=headers))
+        attempts = [first]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done and self._hedge.try_acquire():
+                attempts.append(asyncio.ensure_future(self._attempt("GET", endpoint, params=params, headers=headers)))
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if t.exception() is None), None)
+                if winner is not None:
+                    if winner is not first:
+                        self._hedge.hedge_wins += 1
+                    return winner.result()
+            # Every attempt failed; surface the original error
+            return first.result()
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    async def _attempt(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        # Sessions share upstream capacity fairly; cache hits never get here and don't use a slot
+        async with self._scheduler.slot(self._session_key()):
+            # Only pass extra headers when there are some, keeping plain calls identical to the sync client
+            extra: Dict[str, Any] = {"headers": headers} if headers else {}
+            bucket = self._read_bucket if method in IDEMPOTENT_METHODS else self._write_bucket
+            await bucket.acquire()
+            if not self._breaker.allow():
+                raise CircuitOpenError(
+                    f"Jellyseerr circuit breaker is open for '{method} {self._url(endpoint)}'; "
+                    f"retry in {self._breaker.retry_in():.0f}s"
+                )
+            self._acquire_slot()
+            started = time.monotonic()
+            try:
+                resp = await self._client.request(method, self._url(endpoint), params=params or None, json=json or None, **extra)
+                if resp.status_code != 304:
+                    resp.raise_for_status()
+            except httpx.HTTPError as e:
+                self._admission.record(_endpoint_kind(endpoint), time.monotonic() - started)
+                if is_upstream_failure(e):
+                    self._breaker.record_failure()
+                else:
+                    self._breaker.record_success()
+                raise
+            except BaseException:
+                self._breaker.release()
+                raise
+            finally:
+                self._release_slot()
+            self._breaker.record_success()
+            self._admission.record(_endpoint_kind(endpoint), time.monotonic() - started)
+            if method == "GET":
+                self._latency.record(_endpoint_kind(endpoint), time.monotonic() - started)
+            return resp
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["inflight"] = self._inflight.stats()
+        stats["retries"] = {"retries": self._retries, "giveups": self._retry_giveups}
+        stats["breaker"] = self._breaker.stats()
+        stats["admission"] = self._admission.stats()
+        stats["sessions"] = self._scheduler.stats()
+        stats["rate_limit"] = {"read": self._read_bucket.stats(), "write": self._write_bucket.stats()}
+        stats["latency"] = self._latency.stats()
+        if self._hedge is not None:
+            stats["hedging"] = self._hedge.stats()
+        if self._cache is not None:
+            stats["cache"] = self._cache.stats()
+        if self._media is not None:
+            stats["media_cache"] = self._media.stats()
+        stats["services"] = self._services.stats()
+        stats["duplicates_avoided"] = self.duplicates_avoided
+        return stats
+
+    # Convenience methods for common operations
+    async def search_media(self, query: str, limit: int = 20, progress: Optional[Progress] = None) -> Any:
+        """Search and return up to `limit` results, fetching the pages needed concurrently.
+
+        `progress` is awaited with (results so far, limit) as pages arrive.
+        """
+        params = self._search_params(query)
+        limit = max(1, min(limit, SEARCH_MAX_RESULTS))
+        pages: Dict[int, Any] = {}
+        next_page = 1
+        while not (1 in pages and not isinstance(pages[1], dict)):
+            results = _contiguous_results(pages)
+            last_page = _last_page(pages)
+            if len(results) >= limit or (last_page is not None and next_page > last_page):
+                break
+            wanted = math.ceil((limit - len(results)) / SEARCH_PAGE_SIZE)
+            if last_page is None:
+                # Until page 1 says how many pages exist, speculate at most one concurrent round ahead
+                wanted = min(wanted, self._page_concurrency)
+            end = next_page + wanted - 1 if last_page is None else min(next_page + wanted - 1, last_page)
+            await self._fetch_pages("search", params, range(next_page, end + 1), pages, limit, progress)
+            next_page = end + 1
+
+        first = pages.get(1)
+        if not isinstance(first, dict):
+            return first
+        results = _contiguous_results(pages)[:limit]
+        for item in results:
+            if isinstance(item, dict) and item.get("mediaType") in ("movie", "tv"):
+                self._remember_media(item["mediaType"], item)
+        return {**first, "results": results}
+
+    async def _fetch_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        page_numbers: range,
+        pages: Dict[int, Any],
+        limit: int,
+        progress: Optional[Progress] = None,
+    ) -> None:
+        """Fetch `page_numbers` into `pages`, at most `page_concurrency` at a time.
+
+        Stops once `limit` results are in, and drops pages past the last one as soon as
+        page 1's `totalPages` or a short page shows where the results end.
+        """
+        semaphore = asyncio.Semaphore(self._page_concurrency)
+
+        async def fetch(page: int) -> None:
+            async with semaphore:
+                # Page 1 keeps the plain params so it shares a cache entry with single-page searches
+                page_params = params if page == 1 else {**params, "page": page}
+                pages[page] = await self.request("GET", endpoint, params=page_params)
+
+        tasks = {asyncio.ensure_future(fetch(page)): page for page in page_numbers}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                last = _last_page(pages)
+                for task in done:
+                    error = task.exception()
+                    # Errors for pages past the end (e.g. TMDB's page limit) don't matter
+                    if error is not None and (last is None or tasks[task] <= last):
+                        raise error
+                collected = len(_contiguous_results(pages))
+                if progress is not None:
+                    await progress(min(collected, limit), limit)
+                if collected >= limit:
+                    break
+                if last is not None:
+                    beyond = {task for task in pending if tasks[task] > last}
+                    for task in beyond:
+                        task.cancel()
+                    pending -= beyond
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_media_details(self, media_type: str, media_id: int) -> Any:
+        details = await self.request("GET", f"{media_type}/{media_id}")
+        self._remember_media(media_type, details)
+        return details
+
+    async def request_media(
+        self,
+        media_id: int,
+        media_type: str,
+        is_4k: bool = False,
+        idempotency_key: Optional[str] = None,
+        force: bool = False,
+    ) -> Any:
+        """Request a title, unless what we already know says it is requested or available (`force` skips that check)."""
+        known = self._known_media(media_type, media_id)
+        duplicate = None if force else self._duplicate(known, media_id, media_type, is_4k)
+        if duplicate is not None:
+            return duplicate
+
+        server_id = await self._server_id(media_type, is_4k)
+        if server_id is not None:
+            payload = {"mediaId": media_id, "mediaType": media_type, "is4k": is_4k, "serverId": server_id}
+        else:
+            # Fall back to services listed in the media details; reuse them when we already have them
+            media_details = known
+            if media_details is None or "services" not in media_details:
+                media_details = await self.get_media_details(media_type, media_id)
+                # The fresh details may show what we didn't know yet
+                duplicate = None if force else self._duplicate(media_details, media_id, media_type, is_4k)
+                if duplicate is not None:
+                    return duplicate
+            payload = self._build_request_payload(media_details, media_id, media_type, is_4k)
+            known = media_details
+        created = await self.request("POST", "request", json=payload, idempotency_key=idempotency_key)
+        self._media_request_changed(media_type, media_id, created, known)
+        return created
+
+    async def request_media_bulk(
+        self,
+        items: Sequence[Tuple[int, str, bool]],
+        concurrency: Optional[int] = None,
+        progress: Optional[Progress] = None,
+    ) -> List[Dict[str, Any]]:
+        """Request many titles at once; one item failing doesn't fail the others."""
+        limit = min(concurrency or self.bulk_concurrency, self.bulk_concurrency)
+        outcomes = await run_bounded(
+            [lambda m=m, t=t, k=k: self.request_media(m, t, is_4k=k) for m, t, k in items],
+            limit,
+            progress=progress,
+        )
+        results: List[Dict[str, Any]] = []
+        for (media_id, media_type, is_4k), outcome in zip(items, outcomes):
+            result: Dict[str, Any] = {"media_id": media_id, "media_type": media_type, "is_4k": is_4k}
+            if isinstance(outcome, Exception):
+                result.update(ok=False, error=str(outcome))
+            else:
+                result.update(ok=True, request=outcome)
+            results.append(result)
+        return results
+
+    async def get_request(self, request_id: int) -> Any:
+        return await self.request("GET", f"request/{request_id}")
+
+    async def get_requests(self, request_ids: Sequence[int], progress: Optional[Progress] = None) -> Dict[str, Any]:
+        """Fetch many requests by id, either one call per id or by scanning the `request` list, whichever is fewer calls.
+
+        `progress` is awaited with (ids resolved so far, ids) as the fetch goes.
+        """
+        ids = list(dict.fromkeys(int(i) for i in request_ids))
+        found: Dict[int, Any] = {}
+
+        async def report(resolved: int) -> None:
+            if progress is not None:
+                await progress(resolved, len(ids))
+
+        if self._cache is not None:
+            for request_id in ids:
+                cached = self._cache.get(make_key("GET", f"request/{request_id}"), _MISSING)
+                if cached is not _MISSING:
+                    found[request_id] = cached
+        missing = [i for i in ids if i not in found]
+
+        strategy = "by_id"
+        errors: Dict[int, str] = {}
+        if len(missing) > REQUEST_BATCH_BY_ID_MAX:
+            # The first list page doubles as a probe for how many pages a full scan would take
+            params = {"filter": "all"}
+            first = await self._list_page("request", params, REQUEST_SCAN_PAGE_SIZE, 0)
+            items, more = self._page_items(first, REQUEST_SCAN_PAGE_SIZE, 0)
+            self._collect_requests(items, missing, found)
+            await report(len(found))
+            missing = [i for i in missing if i not in found]
+            total = (first.get("pageInfo") or {}).get("results", 0) if isinstance(first, dict) else 0
+            remaining_pages = max(0, math.ceil(total / REQUEST_SCAN_PAGE_SIZE) - 1)
+            if not missing or not more:
+                # Everything was on the first page, or there is no other page to look in
+                strategy = "scan"
+                errors.update((i, f"Request #{i} not found") for i in missing)
+                missing = []
+            elif remaining_pages < len(missing):
+                strategy = "scan"
+                async for item in self.paginate("request", params, REQUEST_SCAN_PAGE_SIZE, skip=REQUEST_SCAN_PAGE_SIZE):
+                    before = len(found)
+                    self._collect_requests([item], missing, found)
+                    if len(found) > before:
+                        await report(len(found))
+                    if all(i in found for i in missing):
+                        break
+                errors.update((i, f"Request #{i} not found") for i in missing if i not in found)
+                missing = []
+
+        if missing:
+            resolved = len(found)
+            outcomes = await run_bounded(
+                [lambda i=i: self.get_request(i) for i in missing],
+                self.bulk_concurrency,
+                progress=lambda done, _: report(resolved + int(done)),
+            )
+            for request_id, outcome in zip(missing, outcomes):
+                if isinstance(outcome, Exception):
+                    errors[request_id] = str(outcome)
+                else:
+                    found[request_id] = outcome
+
+        await report(len(ids))
+        results = [
+            {"request_id": i, "ok": True, "request": found[i]} if i in found else {"request_id": i, "ok": False, "error": errors[i]}
+            for i in ids
+        ]
+        return {"strategy": strategy, "results": results}
+
+    def _collect_requests(self, items: List[Any], wanted: List[int], found: Dict[int, Any]) -> None:
+        wanted_ids = set(wanted)
+        for item in items:
+            if isinstance(item, dict) and item.get("id") in wanted_ids:
+                found[item["id"]] = item
+                # List items are full request objects, so they can answer later get_request calls too
+                if self._cache is not None:
+                    endpoint = f"request/{item['id']}"
+                    self._cache.set(make_key("GET", endpoint), item, self._cache.ttl_for(endpoint))
+
+    def _duplicate(self, details: Any, media_id: int, media_type: str, is_4k: bool) -> Optional[Dict[str, Any]]:
+        """The `duplicate: true` result if `details` show the title is already requested or available."""
+        if not isinstance(details, dict):
+            return None
+        state = _existing_request_state(details.get("mediaInfo"), is_4k)
+        if state is None:
+            return None
+        self.duplicates_avoided += 1
+        return {"duplicate": True, "state": state, "mediaId": media_id, "mediaType": media_type, "mediaInfo": details["mediaInfo"]}
+
+    def _known_media(self, media_type: str, media_id: int) -> Optional[Dict[str, Any]]:
+        if self._media is None:
+            return None
+        return self._media.get((media_type, int(media_id)))
+
+    def _remember_media(self, media_type: str, details: Any) -> None:
+        if self._media is None or not isinstance(details, dict) or "id" not in details:
+            return
+        key = (media_type, int(details["id"]))
+        known = self._media.get_stale(key)
+        merged = {**known.value, **details} if known is not None else dict(details)
+        self._media.set(key, merged, self._media.ttl_for(media_type))
+
+    def _media_written(self, endpoint: str, json: Optional[Dict[str, Any]]) -> None:
+        """Forget known mediaInfo that a write to `request` or `media` may have changed.
+
+        A new request names its title, so only that one is dropped; anything else (approving,
+        declining or deleting a request, or editing media) doesn't say which title it touched.
+        """
+        if self._media is None or _endpoint_kind(endpoint) not in ("request", "media"):
+            return
+        if normalize_endpoint(endpoint) == "request" and json and isinstance(json.get("mediaId"), int):
+            self._media.invalidate_key((json.get("mediaType"), json["mediaId"]))
+        else:
+            self._media.clear()
+
+    def _media_request_changed(self, media_type: str, media_id: int, created: Any, known: Optional[Dict[str, Any]]) -> None:
+        """A new request changes the title's mediaInfo; keep what the POST told us on top of `known`."""
+        if self._cache is not None:
+            self._cache.invalidate(f"{media_type}/{media_id}")
+        media = created.get("media") if isinstance(created, dict) else None
+        if self._media is not None and known is not None and isinstance(media, dict):
+            self._media.set((media_type, int(media_id)), {**known, "mediaInfo": media}, self._media.ttl_for(media_type))
+
+    async def _list_page(self, endpoint: str, params: Optional[Dict[str, Any]], page_size: int, skip: int) -> Any:
+        # List pages skip the response cache so a full scan doesn't flush it
+        page_params = {**(params or {}), "take": page_size, "skip": skip}
+        return self._decode(await self._send("GET", endpoint, params=page_params))
+
+    async def paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 50,
+        skip: int = 0,
+    ) -> AsyncIterator[Any]:
+        """Yield every item of a `take`/`skip` list endpoint (`request`, `media`, `user`, `issue`).
+
+        The next page is fetched while the current one is consumed, and at most two pages are
+        held at once.
+        """
+        def fetch(skip: int) -> "asyncio.Future[Any]":
+            return asyncio.ensure_future(self._list_page(endpoint, params, page_size, skip))
+
+        pending: Optional[asyncio.Future[Any]] = fetch(skip)
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+                items, more = self._page_items(data, page_size, skip)
+                if more:
+                    skip += page_size
+                    pending = fetch(skip)
+                for item in items:
+                    yield item
+        finally:
+            if pending is not None:
+                pending.cancel()
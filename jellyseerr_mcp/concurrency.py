@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Sequence, TypeVar, Union
+
+T = TypeVar("T")
+
+# Progress callback: (progress, total) -> awaitable, as in MCP progress notifications
+Progress = Callable[[float, Optional[float]], Awaitable[None]]
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls so only one reaches the upstream.
+
+    The shared call runs as its own task, so a caller that gives up (e.g. a cancelled
+    tool call) does not cancel the result the other waiters are still waiting for.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._calls), "coalesced": self.coalesced}
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a call would have to wait longer than the limiter allows."""
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `burst` saved.
+
+    Callers over the limit reserve a future token and sleep until it is due, so the
+    queue drains in arrival order. A call that would wait more than `max_wait` seconds
+    is rejected instead. A `rate` of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: float, max_wait: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self._rate = rate
+        self._burst = max(1.0, burst)
+        self._max_wait = max_wait
+        self._clock = clock
+        self._tokens = self._burst
+        self._updated = clock()
+        self.waiting = 0
+        self.waited = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    async def acquire(self) -> None:
+        if self._rate <= 0:
+            return
+        self._refill()
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+
+        wait = -self._tokens / self._rate
+        if wait > self._max_wait:
+            self._tokens += 1
+            self.rejected += 1
+            raise RateLimitExceeded(f"Upstream rate limit exceeded; would wait {wait:.1f}s (max {self._max_wait:.1f}s)")
+
+        self.waiting += 1
+        try:
+            await asyncio.sleep(wait)
+        except BaseException:
+            # Hand the reserved token back to whoever is queued behind us
+            self._tokens += 1
+            raise
+        finally:
+            self.waiting -= 1
+        self.waited += 1
+        self.total_wait += wait
+        self.max_wait_seen = max(self.max_wait_seen, wait)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self._rate,
+            "burst": self._burst,
+            "queue_depth": self.waiting,
+            "waited": self.waited,
+            "rejected": self.rejected,
+            "avg_wait": round(self.total_wait / self.waited, 3) if self.waited else 0.0,
+            "max_wait": round(self.max_wait_seen, 3),
+        }
+
+
+class LatencyTracker:
+    """Rolling window of recent upstream latencies, grouped by endpoint kind (e.g. `search`, `movie`)."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._window = window
+        self._min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, kind: str, seconds: float) -> None:
+        samples = self._samples.get(kind)
+        if samples is None:
+            samples = self._samples[kind] = deque(maxlen=self._window)
+        samples.append(seconds)
+
+    def percentile(self, kind: str, pct: float) -> Optional[float]:
+        """The `pct` (0-1) latency for `kind`, or None until enough samples were seen."""
+        samples = self._samples.get(kind)
+        if samples is None or len(samples) < self._min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            kind: {
+                "p50": round(self.percentile(kind, 0.5) or 0.0, 3),
+                "p99": round(self.percentile(kind, 0.99) or 0.0, 3),
+                "samples": len(samples),
+            }
+            for kind, samples in self._samples.items()
+        }
+
+
+class HedgeBudget:
+    """Decides when to send a hedged (duplicate) GET and caps the extra load hedging adds.
+
+    Each request earns `max_ratio` of a hedge, saved up to `burst` hedges, so hedges stay
+    near `max_ratio` of recent requests; a long calm period can't be spent all at once when
+    the upstream turns slow.
+    """
+
+    def __init__(self, percentile: float = 0.95, min_delay: float = 0.05, max_ratio: float = 0.1, burst: float = 1.0):
+        self._percentile = percentile
+        self._min_delay = min_delay
+        self._max_ratio = max_ratio
+        self._burst = burst
+        self._credit = 0.0
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def delay(self, latency: LatencyTracker, kind: str) -> Optional[float]:
+        """Seconds to wait for the first attempt before hedging, or None to not hedge."""
+        self.requests += 1
+        self._credit = min(self._burst, self._credit + self._max_ratio)
+        threshold = latency.percentile(kind, self._percentile)
+        if threshold is None:
+            return None
+        return max(self._min_delay, threshold)
+
+    def try_acquire(self) -> bool:
+        # Allow for rounding, e.g. ten requests at 0.1 sum to 0.9999999999999999
+        if self._credit < 1 - 1e-9:
+            return False
+        self._credit -= 1
+        self.hedges += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+
+class BatchAborted(RuntimeError):
+    """Placeholder result for batch items that were not run because an earlier item failed."""
+
+
+async def run_bounded(
+    calls: Sequence[Callable[[], Awaitable[T]]],
+    limit: int,
+    *,
+    stop_on_error: bool = False,
+    progress: Optional[Progress] = None,
+) -> List[Union[T, Exception]]:
+    """Run `calls` with at most `limit` in flight and return their results in order.
+
+    A failing call's exception takes its place in the results instead of failing the batch.
+    With `stop_on_error`, calls that haven't started after the first failure are skipped
+    and get a BatchAborted result. `progress` is awaited with (finished, total) as calls end.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+    results: List[Union[T, Exception]] = [BatchAborted("Not run: an earlier item failed")] * len(calls)
+    failed = False
+    finished = 0
+
+    async def run(index: int, call: Callable[[], Awaitable[T]]) -> None:
+        nonlocal failed, finished
+        async with semaphore:
+            if not (failed and stop_on_error):
+                try:
+                    results[index] = await call()
+                except Exception as e:
+                    results[index] = e
+                    failed = True
+        finished += 1
+        if progress is not None:
+            await progress(finished, len(calls))
+
+    await asyncio.gather(*(run(i, call) for i, call in enumerate(calls)))
+    return results
+
+
+class _Unidentified:
+    """Session key for one call from a caller that couldn't be identified; equal only to itself."""
+
+    __slots__ = ()
+
+
+UNIDENTIFIED = "unidentified"
+
+
+class FairScheduler:
+    """Shares `limit` upstream slots between sessions, at most `per_session` each (0 = no per-session cap).
+
+    When slots are scarce, waiting sessions are served round-robin rather than in arrival
+    order, so one session queueing hundreds of calls cannot starve the others. Calls whose
+    session is None each count as their own session, so they are never capped as a group
+    (their callers may be unrelated), and are reported together as "unidentified".
+
+    Session keys can be usable handles (MCP session ids) or personal data (addresses), so
+    stats() reports each under a salted hash that only means something within this process.
+    """
+
+    def __init__(self, limit: int, per_session: int = 0, max_tracked: int = 256, clock: Callable[[], float] = time.monotonic):
+        self._limit = max(1, limit)
+        self._per_session = per_session
+        self._clock = clock
+        self._in_use = 0
+        self._active: Dict[Hashable, int] = {}
+        # Sessions with queued calls, in the order they will be served
+        self._queues: "OrderedDict[Hashable, Deque[asyncio.Future[None]]]" = OrderedDict()
+        self._max_tracked = max_tracked
+        self._sessions: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._salt = os.urandom(16)
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    @asynccontextmanager
+    async def slot(self, session: Optional[Hashable]) -> AsyncIterator[None]:
+        if session is None:
+            session = _Unidentified()
+        await self.acquire(session)
+        try:
+            yield
+        finally:
+            self.release(session)
+
+    async def acquire(self, session: Hashable) -> None:
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(session, deque()).append(waiter)
+        self._dispatch()
+        started = self._clock()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we were cancelled; hand the slot on
+                self.release(session)
+            else:
+                self._discard(session, waiter)
+            raise
+        self._record_wait(session, self._clock() - started)
+
+    def release(self, session: Hashable) -> None:
+        self._in_use -= 1
+        self._active[session] -= 1
+        if not self._active[session]:
+            del self._active[session]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._in_use < self._limit:
+            for session, queue in self._queues.items():
+                if not self._per_session or self._active.get(session, 0) < self._per_session:
+                    break
+            else:
+                return
+            waiter = queue.popleft()
+            if queue:
+                self._queues.move_to_end(session)
+            else:
+                del self._queues[session]
+            self._in_use += 1
+            self._active[session] = self._active.get(session, 0) + 1
+            waiter.set_result(None)
+
+    def _discard(self, session: Hashable, waiter: "asyncio.Future[None]") -> None:
+        queue = self._queues.get(session)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[session]
+
+    def _record_wait(self, session: Hashable, wait: float) -> None:
+        session = _label(session)
+        stats = self._sessions.pop(session, None) or {"calls": 0, "total_wait": 0.0, "max_wait": 0.0}
+        stats["calls"] += 1
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+        # Most recently active sessions last; forget the oldest beyond `max_tracked`
+        self._sessions[session] = stats
+        while len(self._sessions) > self._max_tracked:
+            self._sessions.popitem(last=False)
+
+    def label(self, session: Hashable) -> str:
+        """How `session` appears in stats(): its kind prefix (e.g. `session:`) and a salted hash."""
+        if session == UNIDENTIFIED:
+            return UNIDENTIFIED
+        text = str(session)
+        kind, sep, _ = text.partition(":")
+        digest = hashlib.blake2b(text.encode(), key=self._salt, digest_size=6).hexdigest()
+        return f"{kind}:{digest}" if sep else digest
+
+    def stats(self) -> Dict[str, Any]:
+        in_flight: Dict[Hashable, int] = {}
+        for session, count in self._active.items():
+            in_flight[_label(session)] = in_flight.get(_label(session), 0) + count
+        queued: Dict[Hashable, int] = {}
+        for session, queue in self._queues.items():
+            queued[_label(session)] = queued.get(_label(session), 0) + len(queue)
+        return {
+            "limit": self._limit,
+            "per_session": self._per_session,
+            "in_use": self._in_use,
+            "queued": self.queued,
+            "sessions": {
+                self.label(session): {
+                    "in_flight": in_flight.get(session, 0),
+                    "queued": queued.get(session, 0),
+                    "calls": stats["calls"],
+                    "avg_wait": round(stats["total_wait"] / stats["calls"], 3),
+                    "max_wait": round(stats["max_wait"], 3),
+                }
+                for session, stats in self._sessions.items()
+            },
+        }
+
+
+def _label(session: Hashable) -> Hashable:
+    return UNIDENTIFIED if isinstance(session, _Unidentified) else session
@@ -12,18 +12,90 @@ class AppConfig:
     jellyseerr_url: str
     jellyseerr_api_key: str
     timeout: float = 15.0
-    # Auth config for SSE
+    # Upstream connection pool
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5.0
+    http2: bool = False
+    # In-process response cache for GETs
+    cache_enabled: bool = True
+    cache_max_entries: int = 1024
+    cache_ttl: float = 30.0
+    cache_detail_ttl: float = 3600.0
+    cache_search_ttl: float = 300.0
+    cache_request_ttl: float = 10.0
+    # Optional SQLite file shared by every server process on the host (None keeps the cache in memory only)
+    cache_path: Optional[str] = None
+    cache_disk_max_entries: int = 10000
+    # With cache_path, how long memory trusts its copy before re-reading the shared file
+    cache_memory_ttl: float = 5.0
+    # Retries for transient upstream failures
+    retry_max_attempts: int = 3
+    retry_backoff_base: float = 0.25
+    retry_backoff_max: float = 10.0
+    # Circuit breaker around the upstream
+    breaker_failure_rate: float = 0.5
+    breaker_min_calls: int = 10
+    breaker_window: int = 20
+    breaker_open_seconds: float = 30.0
+    # Upstream calls one MCP session may have in flight (0 = no per-session cap)
+    session_max_in_flight: int = 16
+    # Load shedding: reject new upstream reads past these (0 disables each check); writes are never shed
+    admission_max_latency: float = 5.0
+    admission_max_queue: int = 256
+    # Client-side token buckets (requests/second, 0 disables)
+    rate_limit_read: float = 0.0
+    rate_limit_read_burst: float = 20.0
+    rate_limit_write: float = 0.0
+    rate_limit_write_burst: float = 5.0
+    rate_limit_max_wait: float = 5.0
+    # Hedged GETs
+    hedge_enabled: bool = False
+    hedge_percentile: float = 0.95
+    hedge_min_delay: float = 0.05
+    hedge_max_ratio: float = 0.1
+    # Concurrent page fetches for multi-page results
+    page_concurrency: int = 4
+    # Seconds between background refreshes of the Radarr/Sonarr service table (0 disables)
+    service_refresh_interval: float = 300.0
+    # Items run at once by bulk tools
+    bulk_concurrency: int = 5
+    # Streamable-HTTP: no per-client session state, so any worker process can answer any request
+    stateless_http: bool = True
+    # Auth config for the HTTP transports
     auth_issuer_url: Optional[str] = None
     auth_resource_server_url: Optional[str] = None
     auth_required_scopes: Optional[list[str]] = None
 
 
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
 def load_config() -> AppConfig:
     load_dotenv()
 
     url = os.getenv("JELLYSEERR_URL", "").strip()
     api_key = os.getenv("JELLYSEERR_API_KEY", "").strip()
-    timeout_str: Optional[str] = os.getenv("JELLYSEERR_TIMEOUT")
 
     auth_issuer_url = os.getenv("MCP_AUTH_ISSUER_URL")
     auth_resource_server_url = os.getenv("MCP_AUTH_RESOURCE_SERVER_URL")
@@ -35,15 +107,46 @@ def load_config() -> AppConfig:
             "Missing configuration. Please set JELLYSEERR_URL and JELLYSEERR_API_KEY (tip: copy .env.example)."
         )
 
-    try:
-        timeout = float(timeout_str) if timeout_str else 15.0
-    except ValueError:
-        timeout = 15.0
-
     return AppConfig(
         jellyseerr_url=url.rstrip("/"),
         jellyseerr_api_key=api_key,
-        timeout=timeout,
+        timeout=_env_float("JELLYSEERR_TIMEOUT", 15.0),
+        max_connections=_env_int("JELLYSEERR_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=_env_int("JELLYSEERR_MAX_KEEPALIVE_CONNECTIONS", 20),
+        keepalive_expiry=_env_float("JELLYSEERR_KEEPALIVE_EXPIRY", 5.0),
+        http2=_env_bool("JELLYSEERR_HTTP2", False),
+        cache_enabled=_env_bool("JELLYSEERR_CACHE_ENABLED", True),
+        cache_max_entries=_env_int("JELLYSEERR_CACHE_MAX_ENTRIES", 1024),
+        cache_ttl=_env_float("JELLYSEERR_CACHE_TTL", 30.0),
+        cache_detail_ttl=_env_float("JELLYSEERR_CACHE_DETAIL_TTL", 3600.0),
+        cache_search_ttl=_env_float("JELLYSEERR_CACHE_SEARCH_TTL", 300.0),
+        cache_request_ttl=_env_float("JELLYSEERR_CACHE_REQUEST_TTL", 10.0),
+        cache_path=os.getenv("JELLYSEERR_CACHE_PATH", "").strip() or None,
+        cache_disk_max_entries=_env_int("JELLYSEERR_CACHE_DISK_MAX_ENTRIES", 10000),
+        cache_memory_ttl=_env_float("JELLYSEERR_CACHE_MEMORY_TTL", 5.0),
+        retry_max_attempts=_env_int("JELLYSEERR_RETRY_MAX_ATTEMPTS", 3),
+        retry_backoff_base=_env_float("JELLYSEERR_RETRY_BACKOFF_BASE", 0.25),
+        retry_backoff_max=_env_float("JELLYSEERR_RETRY_BACKOFF_MAX", 10.0),
+        breaker_failure_rate=_env_float("JELLYSEERR_BREAKER_FAILURE_RATE", 0.5),
+        breaker_min_calls=_env_int("JELLYSEERR_BREAKER_MIN_CALLS", 10),
+        breaker_window=_env_int("JELLYSEERR_BREAKER_WINDOW", 20),
+        breaker_open_seconds=_env_float("JELLYSEERR_BREAKER_OPEN_SECONDS", 30.0),
+        session_max_in_flight=_env_int("JELLYSEERR_SESSION_MAX_IN_FLIGHT", 16),
+        admission_max_latency=_env_float("JELLYSEERR_ADMISSION_MAX_LATENCY", 5.0),
+        admission_max_queue=_env_int("JELLYSEERR_ADMISSION_MAX_QUEUE", 256),
+        rate_limit_read=_env_float("JELLYSEERR_RATE_LIMIT_READ", 0.0),
+        rate_limit_read_burst=_env_float("JELLYSEERR_RATE_LIMIT_READ_BURST", 20.0),
+        rate_limit_write=_env_float("JELLYSEERR_RATE_LIMIT_WRITE", 0.0),
+        rate_limit_write_burst=_env_float("JELLYSEERR_RATE_LIMIT_WRITE_BURST", 5.0),
+        rate_limit_max_wait=_env_float("JELLYSEERR_RATE_LIMIT_MAX_WAIT", 5.0),
+        hedge_enabled=_env_bool("JELLYSEERR_HEDGE_ENABLED", False),
+        hedge_percentile=_env_float("JELLYSEERR_HEDGE_PERCENTILE", 0.95),
+        hedge_min_delay=_env_float("JELLYSEERR_HEDGE_MIN_DELAY", 0.05),
+        hedge_max_ratio=_env_float("JELLYSEERR_HEDGE_MAX_RATIO", 0.1),
+        page_concurrency=_env_int("JELLYSEERR_PAGE_CONCURRENCY", 4),
+        service_refresh_interval=_env_float("JELLYSEERR_SERVICE_REFRESH_INTERVAL", 300.0),
+        bulk_concurrency=_env_int("JELLYSEERR_BULK_CONCURRENCY", 5),
+        stateless_http=_env_bool("MCP_STATELESS_HTTP", True),
         auth_issuer_url=auth_issuer_url,
         auth_resource_server_url=auth_resource_server_url,
         auth_required_scopes=auth_required_scopes,
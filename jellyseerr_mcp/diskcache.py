@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .jsoncodec import dumps, loads
+
+logger = logging.getLogger("jellyseerr_mcp.diskcache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+)
+"""
+
+# (value, seconds until expiry, etag, last_modified); negative once expired
+DiskEntry = Tuple[Any, float, Optional[str], Optional[str]]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class DiskCache:
+    """SQLite (WAL mode) tier behind ResponseCache, shared by every process using the same file.
+
+    Entries outlive the process, so a freshly spawned stdio server starts warm. Expiry is
+    stored as wall-clock time so every process agrees on it. Reads run on a reader thread and
+    writes are queued to a writer thread, so a lock held by another process never blocks the
+    event loop. Every `evict_every` writes, the entries closest to expiry are evicted down to
+    `max_entries`. SQLite errors are logged and treated as misses; the disk tier must never
+    fail a request the upstream could answer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        busy_timeout: float = 1.0,
+        read_timeout: float = 0.05,
+        evict_every: int = 100,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = os.path.expanduser(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._max_entries = max_entries
+        self._evict_every = max(1, evict_every)
+        self._clock = clock
+        # Each connection is only ever used from its own thread
+        self._write_db = sqlite3.connect(self.path, timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+        self._write_db.execute("PRAGMA journal_mode=WAL")
+        self._write_db.execute("PRAGMA synchronous=NORMAL")
+        self._write_db.execute(_SCHEMA)
+        self._write_db.execute("CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)")
+        self._write_db.execute("CREATE INDEX IF NOT EXISTS entries_endpoint ON entries (endpoint)")
+        (self._size,) = self._write_db.execute("SELECT COUNT(*) FROM entries").fetchone()
+        self._read_db = sqlite3.connect(self.path, timeout=read_timeout, isolation_level=None, check_same_thread=False)
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diskcache-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diskcache-write")
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def close(self) -> None:
+        self._reader.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        self._read_db.close()
+        self._write_db.close()
+
+    async def get(self, key: Tuple[Hashable, ...]) -> Optional[DiskEntry]:
+        """Return the stored entry, expired or not, so callers can still revalidate it."""
+        return await asyncio.get_running_loop().run_in_executor(self._reader, self._read, dumps(key))
+
+    def _read(self, key: str) -> Optional[DiskEntry]:
+        try:
+            row = self._read_db.execute(
+                "SELECT value, expires_at, etag, last_modified FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._failed("read", e)
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return loads(row[0]), row[1] - self._clock(), row[2], row[3]
+
+    def set(
+        self,
+        key: Tuple[Hashable, ...],
+        value: Any,
+        ttl: float,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        endpoint = str(key[1]) if len(key) > 1 else ""
+        row = (dumps(key), endpoint, dumps(value), self._clock() + ttl, etag, last_modified)
+        self._submit(self._insert, row)
+
+    def _insert(self, row: Tuple[Any, ...]) -> None:
+        self._write_db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", row)
+        self.writes += 1
+        if self.writes % self._evict_every == 0:
+            self._evict()
+
+    def refresh(self, key: Tuple[Hashable, ...], ttl: float) -> None:
+        self._submit(self._execute, "UPDATE entries SET expires_at = ? WHERE key = ?", (self._clock() + ttl, dumps(key)))
+
+    def invalidate(self, endpoint: str) -> None:
+        """Drop every entry for `endpoint` (already normalized) and the endpoints below it."""
+        self._submit(
+            self._execute,
+            "DELETE FROM entries WHERE endpoint = ? OR endpoint LIKE ? ESCAPE '\\'",
+            (endpoint, _escape_like(endpoint) + "/%"),
+        )
+
+    def invalidate_key(self, key: Tuple[Hashable, ...]) -> None:
+        self._submit(self._execute, "DELETE FROM entries WHERE key = ?", (dumps(key),))
+
+    def clear(self) -> None:
+        self._submit(self._execute, "DELETE FROM entries", ())
+
+    async def flush(self) -> None:
+        """Wait until every queued write has been applied."""
+        await asyncio.get_running_loop().run_in_executor(self._writer, lambda: None)
+
+    def _submit(self, fn: Callable[..., None], *args: Any) -> None:
+        self._writer.submit(self._run_write, fn, args)
+
+    def _run_write(self, fn: Callable[..., None], args: Tuple[Any, ...]) -> None:
+        try:
+            fn(*args)
+        except sqlite3.Error as e:
+            self._failed("write", e)
+
+    def _execute(self, sql: str, params: Tuple[Any, ...]) -> None:
+        self._write_db.execute(sql, params)
+
+    def _evict(self) -> None:
+        (self._size,) = self._write_db.execute("SELECT COUNT(*) FROM entries").fetchone()
+        excess = self._size - self._max_entries
+        if excess > 0:
+            self._write_db.execute(
+                "DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries ORDER BY expires_at LIMIT ?)", (excess,)
+            )
+            self._size -= excess
+            self.evictions += excess
+
+    def _failed(self, action: str, error: sqlite3.Error) -> None:
+        self.errors += 1
+        logger.warning(f"⚠️ Disk cache {action} failed, continuing without it: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            # As of the last eviction check
+            "size": self._size,
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
@@ -0,0 +1,41 @@
+"""JSON encode/decode using the fastest codec available: orjson, then msgspec, then the stdlib."""
+
+from __future__ import annotations
+
+from typing import Any, Union
+
+try:
+    import orjson
+
+    BACKEND = "orjson"
+
+    def loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+
+except ImportError:
+    try:
+        import msgspec
+
+        BACKEND = "msgspec"
+        _decoder = msgspec.json.Decoder()
+        _encoder = msgspec.json.Encoder(enc_hook=str)
+
+        def loads(data: Union[bytes, str]) -> Any:
+            return _decoder.decode(data)
+
+        def dumps(obj: Any) -> str:
+            return _encoder.encode(obj).decode()
+
+    except ImportError:
+        import json
+
+        BACKEND = "json"
+
+        def loads(data: Union[bytes, str]) -> Any:
+            return json.loads(data)
+
+        def dumps(obj: Any) -> str:
+            return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
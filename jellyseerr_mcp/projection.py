@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Enough for an agent to pick a title and request it; everything else costs context tokens
+DEFAULT_SEARCH_FIELDS: Sequence[str] = (
+    "id",
+    "mediaType",
+    "title",
+    "name",
+    "releaseDate",
+    "firstAirDate",
+    "mediaInfo.status",
+)
+PAGE_FIELDS: Sequence[str] = ("page", "totalPages", "totalResults")
+ALL_FIELDS = "*"
+
+_MISSING = object()
+
+
+def _lookup(item: Any, path: List[str]) -> Any:
+    for part in path:
+        if not isinstance(item, dict) or part not in item:
+            return _MISSING
+        item = item[part]
+    return item
+
+
+def project(item: Any, fields: Iterable[str]) -> Any:
+    """Keep only `fields` of `item`. Dotted paths (`mediaInfo.status`) keep nested values; missing fields are skipped."""
+    if not isinstance(item, dict):
+        return item
+    result: Dict[str, Any] = {}
+    for field in fields:
+        path = field.split(".")
+        value = _lookup(item, path)
+        if value is _MISSING:
+            continue
+        target = result
+        for part in path[:-1]:
+            target = target.setdefault(part, {})
+        target[path[-1]] = value
+    return result
+
+
+def project_results(data: Any, fields: Optional[Sequence[str]] = None) -> Any:
+    """Trim a paginated Jellyseerr response to its page info and the projected `results`."""
+    fields = DEFAULT_SEARCH_FIELDS if fields is None else fields
+    if ALL_FIELDS in fields or not isinstance(data, dict):
+        return data
+    trimmed = project(data, PAGE_FIELDS)
+    if "results" in data:
+        trimmed["results"] = [project(item, fields) for item in data["results"]]
+    return trimmed
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import httpx
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Methods that are safe to repeat without an idempotency key
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+def parse_retry_after(value: Optional[str], now: Callable[[], float] = time.time) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """Bounded exponential backoff with full jitter for transient upstream failures."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 10.0
+
+    def next_delay(self, attempt: int, error: httpx.HTTPError) -> Optional[float]:
+        """Seconds to wait before retrying after `attempt` failed, or None to give up."""
+        if attempt >= self.max_attempts:
+            return None
+
+        retry_after = None
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            if status not in RETRYABLE_STATUSES:
+                return None
+            if status in (429, 503):
+                retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+        elif not isinstance(error, httpx.TransportError):
+            return None
+
+        if retry_after is not None:
+            # Waiting longer than we are willing to is worse than failing now
+            return retry_after if retry_after <= self.max_delay else None
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, backoff)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling Jellyseerr while the circuit breaker is open."""
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Whether an error says something about upstream health (as opposed to a bad request)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUSES
+    return isinstance(error, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by the failure rate over the last `window` calls."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: int = 20,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._failure_rate = failure_rate
+        self._min_calls = min_calls
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._probes < self._half_open_max_calls:
+            self._probes += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self) -> None:
+        """Give back a half-open probe slot when the call ended without an outcome (e.g. cancelled)."""
+        if self._state == self.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record_success(self) -> None:
+        if self._state == self.HALF_OPEN:
+            self._state = self.CLOSED
+            self._outcomes.clear()
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        if self._state == self.HALF_OPEN:
+            self._trip()
+            return
+        self._outcomes.append(False)
+        if len(self._outcomes) >= self._min_calls and self._current_failure_rate() >= self._failure_rate:
+            self._trip()
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._open_seconds - (self._clock() - self._opened_at))
+
+    def _trip(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+
+    def _current_failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failure_rate": round(self._current_failure_rate(), 3),
+            "window_calls": len(self._outcomes),
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in(), 1),
+        }
+
+
+class OverloadedError(RuntimeError):
+    """Raised instead of calling Jellyseerr while admission control is shedding load."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Sheds new upstream reads while Jellyseerr is slow or too many calls are already queued.
+
+    Latency is an exponentially weighted average per endpoint kind (e.g. `search`, `movie`),
+    so one slow kind doesn't shed the others, and a kind is only judged after `min_samples`
+    calls. The average halves for every `half_life` seconds without new samples, so shedding
+    ends on its own once slow calls stop coming back. A threshold of 0 disables that check.
+    """
+
+    def __init__(
+        self,
+        max_latency: float = 0.0,
+        max_queue: int = 0,
+        min_samples: int = 10,
+        alpha: float = 0.2,
+        half_life: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_latency = max_latency
+        self._max_queue = max_queue
+        self._min_samples = min_samples
+        self._alpha = alpha
+        self._half_life = half_life
+        self._clock = clock
+        # kind -> [average latency, when it was last updated, samples seen]
+        self._kinds: Dict[str, List[float]] = {}
+        self.shed = 0
+
+    def latency(self, kind: str) -> Optional[float]:
+        """Decayed average latency for `kind`, or None until `min_samples` calls were seen."""
+        state = self._kinds.get(kind)
+        if state is None or state[2] < self._min_samples:
+            return None
+        return state[0] * 0.5 ** ((self._clock() - state[1]) / self._half_life)
+
+    def record(self, kind: str, seconds: float) -> None:
+        state = self._kinds.get(kind)
+        if state is None:
+            self._kinds[kind] = [seconds, self._clock(), 1]
+            return
+        current = state[0] * 0.5 ** ((self._clock() - state[1]) / self._half_life)
+        state[0] = current + self._alpha * (seconds - current)
+        state[1] = self._clock()
+        state[2] += 1
+
+    def check(self, kind: str, queued: int) -> None:
+        """Raise OverloadedError if a new upstream read of `kind` should be rejected right now."""
+        if self._max_queue and queued >= self._max_queue:
+            self.shed += 1
+            raise OverloadedError(f"Jellyseerr MCP is overloaded ({queued} upstream calls queued); retry in 1s", 1.0)
+        latency = self.latency(kind)
+        if self._max_latency and latency is not None and latency > self._max_latency:
+            retry_after = self._half_life * math.log2(latency / self._max_latency)
+            self.shed += 1
+            raise OverloadedError(
+                f"Jellyseerr is responding slowly to '{kind}' calls ({latency:.1f}s on average); "
+                f"retry in {math.ceil(retry_after)}s",
+                retry_after,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = {kind: self.latency(kind) for kind in self._kinds}
+        return {
+            "shedding": sorted(
+                kind for kind, latency in latencies.items()
+                if self._max_latency and latency is not None and latency > self._max_latency
+            ),
+            "latency": {kind: round(latency, 3) for kind, latency in latencies.items() if latency is not None},
+            "max_latency": self._max_latency,
+            "max_queue": self._max_queue,
+            "shed": self.shed,
+        }
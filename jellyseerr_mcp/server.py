@@ -1,79 +1,310 @@
 from __future__ import annotations
 
+import os
+import socket
 from typing import Any
 
+import anyio
+from pydantic import BaseModel
 from mcp.server.fastmcp import FastMCP
+from mcp.server.auth.middleware.auth_context import get_access_token
 from mcp.server.auth.settings import AuthSettings
 
-from .client import JellyseerrClient
-from .config import load_config
+from .client import SEARCH_MAX_RESULTS, AsyncJellyseerrClient
+from .concurrency import BatchAborted, Progress, run_bounded
+from .config import AppConfig, load_config
+from .jsoncodec import dumps
+from .projection import DEFAULT_SEARCH_FIELDS, project_results
 from .logging_setup import setup_logging
+from .workers import HAS_REUSEPORT, WorkerSupervisor, listen_socket
 
 logger = setup_logging()
 mcp = FastMCP("jellyseerr")
 
+ALLOWED_RAW_METHODS = {"GET", "POST", "PUT", "DELETE"}
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+HTTP_TRANSPORTS = ("sse", "streamable-http")
+
 # Client will be initialized in run()
-_client: JellyseerrClient | None = None
+_client: AsyncJellyseerrClient | None = None
+
+
+def _session_key() -> str | None:
+    """Who the current tool call belongs to, for per-session upstream limits.
+
+    Stateless streamable HTTP has no session id, and behind NAT or a reverse proxy many
+    agents share one address, so the peer address is never used. Such callers can send an
+    `X-MCP-Client-Id` header; otherwise the first `X-Forwarded-For` hop is used. Both are
+    client-supplied, which is fine for fairness but not for anything security-related.
+    Returns None when the caller can't be identified; those calls are not capped per session.
+    """
+    token = get_access_token()
+    if token is not None:
+        return f"client:{token.client_id}"
+    try:
+        request = mcp.get_context().request_context.request
+    except ValueError:
+        # Not inside a tool call (e.g. the background service refresh)
+        return "server"
+    if request is None:
+        return "stdio"
+    session_id = request.headers.get("mcp-session-id") or request.query_params.get("session_id")
+    if session_id:
+        return f"session:{session_id}"
+    client_id = request.headers.get("x-mcp-client-id")
+    if client_id:
+        return f"header:{client_id}"
+    forwarded = request.headers.get("x-forwarded-for", "").split(",")[0].strip()
+    if forwarded:
+        return f"forwarded:{forwarded}"
+    return None
+
+
+def _progress() -> Progress:
+    """Progress callback for the current tool call, sent as MCP progress notifications.
+
+    Nothing is sent unless the caller asked for progress (by passing a progressToken), and
+    updates that don't move forward are dropped, since MCP requires progress to increase.
+    """
+    last = -1.0
+
+    async def report(progress: float, total: float | None = None) -> None:
+        nonlocal last
+        if progress <= last:
+            return
+        last = progress
+        try:
+            await mcp.get_context().report_progress(progress, total)
+        except Exception as e:
+            # Outside a request, or the client went away; progress is best-effort
+            logger.debug(f"Progress notification not sent: {e}")
+
+    return report
+
+
+def _encode(data: Any) -> Any:
+    # Hand FastMCP compact, pre-encoded JSON so it doesn't re-serialize (indented) with pydantic
+    return data if isinstance(data, str) else dumps(data)
 
 
 @mcp.tool(description="Simple liveness check.")
 def ping() -> Any:
     logger.info("🏓 Ping received")
-    return {
+    result: dict[str, Any] = {
         "ok": True,
         "service": "jellyseerr-mcp",
     }
+    if _client is not None:
+        result.update(_client.stats())
+    return result
 
 
-@mcp.tool(description="Search Jellyseerr for media by text query.")
-def search_media(query: str) -> Any:
+@mcp.tool(
+    description=(
+        f"Search Jellyseerr for media by text query, returning up to `limit` (at most {SEARCH_MAX_RESULTS}) results. "
+        "Results are trimmed to "
+        f"{', '.join(DEFAULT_SEARCH_FIELDS)}; pass `fields` (dotted paths allowed) to choose others, or ['*'] for everything."
+    )
+)
+async def search_media(query: str, limit: int = 20, fields: list[str] | None = None) -> Any:
     logger.info(f"🔎 Searching media for query: [bold cyan]{query}[/]")
     assert _client is not None
-    data = _client.search_media(query)
+    limit = max(1, min(limit, SEARCH_MAX_RESULTS))
+    data = await _client.search_media(query, limit=limit, progress=_progress())
     logger.info("✅ Search complete")
-    return data
+    return _encode(project_results(data, fields))
 
 
-@mcp.tool(description="Create a media request in Jellyseerr.")
-def request_media(media_id: int, media_type: str) -> Any:
+@mcp.tool(description="Get Jellyseerr details for a movie or TV show (media_type 'movie' or 'tv').")
+async def get_media_details(media_id: int, media_type: str) -> Any:
+    logger.info(f"🎬 Fetching {media_type} #{media_id}")
+    assert _client is not None
+    data = await _client.get_media_details(media_type=media_type, media_id=media_id)
+    logger.info("✅ Details fetched")
+    return _encode(data)
+
+
+@mcp.tool(
+    description=(
+        "Create a media request in Jellyseerr. If the title is already requested or available, "
+        "its existing state is returned with `duplicate: true` instead; pass `force` to request anyway."
+    )
+)
+async def request_media(media_id: int, media_type: str, force: bool = False) -> Any:
     logger.info(f"📥 Requesting media id={media_id} type={media_type}")
     assert _client is not None
-    data = _client.request_media(media_id=media_id, media_type=media_type)
-    logger.info("✅ Request created")
-    return data
+    data = await _client.request_media(media_id=media_id, media_type=media_type, force=force)
+    if isinstance(data, dict) and data.get("duplicate"):
+        logger.info(f"♻️ Already {data['state']}; no request created")
+    else:
+        logger.info("✅ Request created")
+    return _encode(data)
+
+
+class MediaRequestItem(BaseModel):
+    media_id: int
+    media_type: str
+    is_4k: bool = False
+
+
+@mcp.tool(
+    description=(
+        "Create many media requests in one call. Items run concurrently; each result reports "
+        "`ok` with the created request, or the error for that item."
+    )
+)
+async def request_media_bulk(items: list[MediaRequestItem], concurrency: int | None = None) -> Any:
+    logger.info(f"📥 Bulk requesting {len(items)} titles")
+    assert _client is not None
+    results = await _client.request_media_bulk(
+        [(item.media_id, item.media_type, item.is_4k) for item in items],
+        concurrency=concurrency,
+        progress=_progress(),
+    )
+    succeeded = sum(1 for r in results if r["ok"])
+    logger.info(f"✅ Bulk request complete: {succeeded}/{len(results)} succeeded")
+    return _encode({"succeeded": succeeded, "failed": len(results) - succeeded, "results": results})
 
 
 @mcp.tool(description="Get Jellyseerr request details/status by id.")
-def get_request(request_id: int) -> Any:
+async def get_request(request_id: int) -> Any:
     logger.info(f"📄 Fetching request #{request_id}")
     assert _client is not None
-    data = _client.get_request(request_id=request_id)
+    data = await _client.get_request(request_id=request_id)
     logger.info("✅ Request fetched")
-    return data
+    return _encode(data)
+
+
+@mcp.tool(
+    description=(
+        "Get many Jellyseerr requests by id in one call. Small batches are fetched concurrently; "
+        "large ones scan the request list instead when that takes fewer upstream calls."
+    )
+)
+async def get_requests(request_ids: list[int]) -> Any:
+    logger.info(f"📄 Fetching {len(request_ids)} requests")
+    assert _client is not None
+    data = await _client.get_requests(request_ids, progress=_progress())
+    logger.info(f"✅ Requests fetched ({data['strategy']})")
+    return _encode(data)
 
 
 @mcp.tool(description="(Advanced) Low-level tool to call any Jellyseerr endpoint. Use with caution.")
-def raw_request(method: str, endpoint: str, params: dict | None = None, body: dict | None = None) -> Any:
+async def raw_request(method: str, endpoint: str, params: dict | None = None, body: dict | None = None) -> Any:
     logger.info(f"🛠️ Raw request {method.upper()} {endpoint}")
-
-    allowed_methods = {"GET", "POST", "PUT", "DELETE"}
-    if method.upper() not in allowed_methods:
-        raise ValueError(f"Unsupported method: {method}. Must be one of {allowed_methods}")
+    _check_raw_method(method)
 
     assert _client is not None
-    data = _client.request(method=method, endpoint=endpoint, params=params, json=body)
+    # No transformation happens here, so writes and uncached reads skip the decode/re-encode round trip
+    data = await _client.request(method=method, endpoint=endpoint, params=params, json=body, raw=True)
     logger.info("✅ Raw request complete")
-    return data
+    return _encode(data)
+
 
+def _check_raw_method(method: str) -> None:
+    if method.upper() not in ALLOWED_RAW_METHODS:
+        raise ValueError(f"Unsupported method: {method}. Must be one of {ALLOWED_RAW_METHODS}")
 
-def run(transport: str = "stdio", port: int = 8000) -> None:
+
+class RawRequestItem(BaseModel):
+    method: str
+    endpoint: str
+    params: dict | None = None
+    body: dict | None = None
+
+
+@mcp.tool(
+    description=(
+        "(Advanced) Run many raw_request calls concurrently in one tool call. Results keep the input order; "
+        "set `stop_on_error` to skip calls that haven't started once one fails."
+    )
+)
+async def raw_batch(requests: list[RawRequestItem], stop_on_error: bool = False, concurrency: int | None = None) -> Any:
+    logger.info(f"🛠️ Raw batch of {len(requests)} requests")
+    assert _client is not None
+    client = _client
+
+    def call(item: RawRequestItem) -> Any:
+        async def run() -> Any:
+            _check_raw_method(item.method)
+            return await client.request(method=item.method, endpoint=item.endpoint, params=item.params, json=item.body)
+        return run
+
+    limit = min(concurrency or client.bulk_concurrency, client.bulk_concurrency)
+    outcomes = await run_bounded([call(item) for item in requests], limit, stop_on_error=stop_on_error, progress=_progress())
+    results: list[dict[str, Any]] = []
+    for outcome in outcomes:
+        if isinstance(outcome, BatchAborted):
+            results.append({"ok": False, "skipped": True, "error": str(outcome)})
+        elif isinstance(outcome, Exception):
+            results.append({"ok": False, "error": str(outcome)})
+        else:
+            results.append({"ok": True, "data": outcome})
+    succeeded = sum(1 for r in results if r["ok"])
+    logger.info(f"✅ Raw batch complete: {succeeded}/{len(results)} succeeded")
+    return _encode({"succeeded": succeeded, "failed": len(results) - succeeded, "results": results})
+
+
+async def _serve_socket(transport: str, sock: socket.socket) -> None:
+    import uvicorn
+
+    app = mcp.sse_app() if transport == "sse" else mcp.streamable_http_app()
+    server = uvicorn.Server(uvicorn.Config(app, log_level=mcp.settings.log_level.lower()))
+    await server.serve(sockets=[sock])
+
+
+async def _serve(config: AppConfig, transport: str, sock: socket.socket | None = None) -> None:
     global _client
+    _client = AsyncJellyseerrClient(config, session_key=_session_key)
+    try:
+        await _client.start()
+        if sock is not None:
+            await _serve_socket(transport, sock)
+        elif transport == "sse":
+            await mcp.run_sse_async()
+        elif transport == "streamable-http":
+            await mcp.run_streamable_http_async()
+        else:
+            await mcp.run_stdio_async()
+    finally:
+        await _client.aclose()
+
+
+def _run_worker(slot: int, config: AppConfig, transport: str, port: int, sock: socket.socket | None) -> None:
+    if sock is None:
+        sock = listen_socket(mcp.settings.host, port)
+    logger.info(f"👷 Worker {slot} (pid {os.getpid()}) serving on {mcp.settings.host}:{port}")
+    anyio.run(_serve, config, transport, sock)
+
+
+def _run_workers(config: AppConfig, transport: str, port: int, workers: int) -> None:
+    if transport != "streamable-http" or not config.stateless_http:
+        raise RuntimeError(
+            "Multiple workers need the stateless streamable-http transport; SSE and stateful sessions must stay in one process."
+        )
+    if HAS_REUSEPORT:
+        # Each worker binds its own SO_REUSEPORT socket; this one only claims the port and fails fast if it is taken
+        reserved = listen_socket(mcp.settings.host, port, listen=False)
+        shared = None
+    else:
+        reserved = shared = listen_socket(mcp.settings.host, port, reuse_port=False)
+    logger.info(f"🧩 Starting {workers} workers on {mcp.settings.host}:{port}")
+    try:
+        WorkerSupervisor(_run_worker, workers, args=(config, transport, port, shared)).run()
+    finally:
+        reserved.close()
+
+
+def run(transport: str = "stdio", port: int = 8000, workers: int = 1) -> None:
+    if transport not in TRANSPORTS:
+        raise RuntimeError(f"Unsupported transport '{transport}'. Use one of: {', '.join(TRANSPORTS)}")
     logger.info("🚀 Starting Jellyseerr MCP server…")
     config = load_config()
-    _client = JellyseerrClient(config)
 
-    if transport == "sse":
+    if transport in HTTP_TRANSPORTS:
         mcp.settings.port = port
+        if transport == "streamable-http":
+            mcp.settings.stateless_http = config.stateless_http
         if config.auth_issuer_url:
              mcp.settings.auth = AuthSettings(
                  issuer_url=config.auth_issuer_url,
@@ -81,10 +312,9 @@ def run(transport: str = "stdio", port: int = 8000) -> None:
                  required_scopes=config.auth_required_scopes,
              )
         else:
-             logger.warning("⚠️ No Auth Issuer URL provided. SSE server will run without Auth configuration (if supported by MCP lib).")
+             logger.warning("⚠️ No Auth Issuer URL provided. HTTP server will run without Auth configuration (if supported by MCP lib).")
 
-    try:
-        mcp.run(transport=transport)
-    finally:
-        if _client is not None:
-            _client.close()
+    if workers > 1:
+        _run_workers(config, transport, port, workers)
+        return
+    anyio.run(_serve, config, transport)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("jellyseerr_mcp.services")
+
+SERVICE_KINDS = {"movie": "radarr", "tv": "sonarr"}
+
+Fetch = Callable[[str], Awaitable[Any]]
+
+
+class ServiceRegistry:
+    """Radarr/Sonarr server ids by (service, is_4k), loaded from `service/radarr` and `service/sonarr`.
+
+    The table rarely changes, so it is resolved once and refreshed in the background
+    instead of being looked up on every request.
+    """
+
+    def __init__(self) -> None:
+        self._servers: Dict[Tuple[str, bool], Dict[str, Any]] = {}
+        self.loaded_at: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def resolve(self, media_type: str, is_4k: bool) -> Optional[int]:
+        server = self._servers.get((SERVICE_KINDS.get(media_type, ""), is_4k))
+        return server["id"] if server else None
+
+    async def refresh(self, fetch: Fetch) -> None:
+        kinds = sorted(set(SERVICE_KINDS.values()))
+        try:
+            listings = await asyncio.gather(*(fetch(f"service/{kind}") for kind in kinds))
+        except Exception:
+            self.failures += 1
+            raise
+        servers: Dict[Tuple[str, bool], Dict[str, Any]] = {}
+        for kind, listing in zip(kinds, listings):
+            for server in listing if isinstance(listing, list) else []:
+                key = (kind, bool(server.get("is4k")))
+                # The default server wins; otherwise keep the first one listed
+                if key not in servers or (server.get("isDefault") and not servers[key].get("isDefault")):
+                    servers[key] = server
+        self._servers = servers
+        self.loaded_at = time.monotonic()
+        self.refreshes += 1
+
+    def start(self, fetch: Fetch, interval: float) -> None:
+        """Load the table in the background, then refresh it every `interval` seconds (0 = load once)."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._refresh_forever(fetch, interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_forever(self, fetch: Fetch, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh(fetch)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not refresh Radarr/Sonarr services, keeping the previous table: {e}")
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        servers: List[Dict[str, Any]] = [
+            {"service": kind, "is4k": is_4k, "id": server.get("id"), "name": server.get("name")}
+            for (kind, is_4k), server in sorted(self._servers.items())
+        ]
+        return {
+            "servers": servers,
+            "age": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at is not None else None,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
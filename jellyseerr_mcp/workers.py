@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import signal
+import socket
+import time
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, Sequence
+
+logger = logging.getLogger("jellyseerr_mcp.workers")
+
+HAS_REUSEPORT = hasattr(socket, "SO_REUSEPORT")
+
+
+def listen_socket(
+    host: str,
+    port: int,
+    *,
+    reuse_port: bool = HAS_REUSEPORT,
+    listen: bool = True,
+    backlog: int = 2048,
+) -> socket.socket:
+    """Bind a TCP socket for `host:port`.
+
+    With `reuse_port`, every worker binds its own socket to the same port and the kernel
+    spreads incoming connections across them.
+    """
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    try:
+        sock.bind((host, port))
+        if listen:
+            sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(target: Callable[..., Any], slot: int, args: Sequence[Any]) -> None:
+    # The supervisor's SIGTERM handler is inherited across fork; workers should just exit
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    target(slot, *args)
+
+
+class WorkerSupervisor:
+    """Keeps `workers` forked processes running `target(slot, *args)` and restarts any that exit.
+
+    A worker that dies within `min_uptime` seconds of starting is restarted after a delay
+    that doubles up to `max_backoff`, so a crash on startup doesn't turn into a fork loop.
+    """
+
+    def __init__(
+        self,
+        target: Callable[..., Any],
+        workers: int,
+        args: Sequence[Any] = (),
+        min_uptime: float = 5.0,
+        max_backoff: float = 30.0,
+    ):
+        self._ctx = multiprocessing.get_context("fork")
+        self._target = target
+        self._args = tuple(args)
+        self._workers = max(1, workers)
+        self._min_uptime = min_uptime
+        self._max_backoff = max_backoff
+        self._procs: Dict[int, Any] = {}
+        self._started: Dict[int, float] = {}
+        self._backoff: Dict[int, float] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._stopping = False
+        self.restarts = 0
+
+    @property
+    def alive(self) -> int:
+        return sum(1 for proc in self._procs.values() if proc.is_alive())
+
+    def start(self) -> None:
+        for slot in range(self._workers):
+            self._spawn(slot)
+
+    def _spawn(self, slot: int) -> None:
+        proc = self._ctx.Process(
+            target=_run_worker,
+            args=(self._target, slot, self._args),
+            name=f"jellyseerr-mcp-worker-{slot}",
+        )
+        proc.start()
+        self._procs[slot] = proc
+        self._started[slot] = time.monotonic()
+
+    def tick(self, timeout: float = 1.0) -> None:
+        """Start workers that are due a restart, then wait up to `timeout` for any to exit."""
+        now = time.monotonic()
+        for slot, at in list(self._restart_at.items()):
+            if at <= now:
+                del self._restart_at[slot]
+                self._spawn(slot)
+        if self._restart_at:
+            timeout = max(0.0, min(timeout, min(self._restart_at.values()) - now))
+
+        sentinels = {proc.sentinel: slot for slot, proc in self._procs.items()}
+        for sentinel in wait(list(sentinels), timeout=timeout):
+            slot = sentinels[sentinel]
+            proc = self._procs.pop(slot)
+            proc.join()
+            if self._stopping:
+                continue
+            if time.monotonic() - self._started[slot] < self._min_uptime:
+                self._backoff[slot] = min(self._max_backoff, max(1.0, self._backoff.get(slot, 0.0) * 2))
+            else:
+                self._backoff[slot] = 0.0
+            delay = self._backoff[slot]
+            logger.warning(f"⚠️ Worker {slot} (pid {proc.pid}) exited with code {proc.exitcode}; restarting in {delay:.0f}s")
+            self._restart_at[slot] = time.monotonic() + delay
+            self.restarts += 1
+
+    def run(self) -> None:
+        """Supervise until SIGTERM or Ctrl-C, then stop every worker."""
+        self.start()
+        previous = signal.signal(signal.SIGTERM, self._request_stop)
+        try:
+            while not self._stopping:
+                self.tick()
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            self.stop()
+
+    def _request_stop(self, *_: Any) -> None:
+        self._stopping = True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stopping = True
+        self._restart_at.clear()
+        for proc in self._procs.values():
+            if proc.is_alive():
+                proc.terminate()
+        deadline = time.monotonic() + timeout
+        for proc in self._procs.values():
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+        self._procs.clear()
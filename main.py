@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import os
 import sys
 
@@ -23,15 +22,21 @@ if __name__ == "__main__":
     parser.add_argument(
         "--transport",
         default="stdio",
-        choices=["stdio", "sse"],
+        choices=["stdio", "sse", "streamable-http"],
         help="Transport protocol to use (default: stdio)",
     )
     parser.add_argument(
         "--port",
         type=int,
         default=int(os.environ.get("PORT", 8000)),
-        help="Port to serve SSE on (default: $PORT or 8000)",
+        help="Port for the HTTP transports (default: $PORT or 8000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WORKERS", 1)),
+        help="Server processes sharing the port, restarted if they crash; streamable-http only (default: $WORKERS or 1)",
     )
     args = parser.parse_args()
 
-    asyncio.run(run_mcp(transport=args.transport, port=args.port))
+    run_mcp(transport=args.transport, port=args.port, workers=args.workers)
@@ -1,5 +1,8 @@
+import json
+
+import httpx
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import os
 from jellyseerr_mcp import server
 from jellyseerr_mcp.config import AppConfig
@@ -14,12 +17,16 @@ def mock_env(monkeypatch):
 @pytest.fixture(autouse=True)
 def setup_teardown_client(mock_env):
     # Manually initialize the client as server.run() would
-    # We patch httpx.Client to capture the "network" calls
-    with patch("httpx.Client") as mock_http:
+    # We patch httpx.AsyncClient to capture the "network" calls
+    with patch("httpx.AsyncClient") as mock_http:
         # Mock the response
+        mock_response = httpx.Response(
+            200,
+            json={"results": [{"id": 999, "title": "Integration Mov"}]},
+            request=httpx.Request("GET", "http://integration.test/api/v1/search"),
+        )
         mock_instance = mock_http.return_value
-        mock_instance.request.return_value.json.return_value = {"results": [{"id": 999, "title": "Integration Mov"}]}
-        mock_instance.request.return_value.raise_for_status.return_value = None
+        mock_instance.request = AsyncMock(return_value=mock_response)
         
         # Initialize server._client
         config = AppConfig(
@@ -27,18 +34,19 @@ def setup_teardown_client(mock_env):
             jellyseerr_api_key="integration-key"
         )
         # We need to inject this into the server module
-        with patch("jellyseerr_mcp.server._client", server.JellyseerrClient(config)):
+        with patch("jellyseerr_mcp.server._client", server.AsyncJellyseerrClient(config)):
             yield mock_instance
 
-def test_search_media_integration(setup_teardown_client):
+@pytest.mark.asyncio
+async def test_search_media_integration(setup_teardown_client):
     """
     Tests that calling the server tool correctly calls the client which calls httpx.
     """
     # Call the server tool
-    result = server.search_media("Integration Mov")
+    result = await server.search_media("Integration Mov")
     
     # Verify result from mock
-    assert result == {"results": [{"id": 999, "title": "Integration Mov"}]}
+    assert json.loads(result) == {"results": [{"id": 999, "title": "Integration Mov"}]}
     
     # Verify httpx call
     setup_teardown_client.request.assert_called_with(
@@ -0,0 +1,74 @@
+from jellyseerr_mcp.cache import ResponseCache, make_key
+
+
+def test_make_key_normalizes_method_endpoint_and_params():
+    assert make_key("get", "/Search/", {"b": 2, "a": "x"}) == make_key("GET", "search", {"a": "x", "b": "2"})
+    assert make_key("GET", "search", {"a": None}) == make_key("GET", "search")
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(clock=clock)
+    key = make_key("GET", "request/1")
+    cache.set(key, {"id": 1}, ttl=10)
+
+    clock.now = 9.9
+    assert cache.get(key) == {"id": 1}
+    clock.now = 10.0
+    assert cache.get(key) is None
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = ResponseCache(max_entries=2)
+    a, b, c = (make_key("GET", f"movie/{i}") for i in range(3))
+    cache.set(a, "a", ttl=60)
+    cache.set(b, "b", ttl=60)
+    cache.get(a)
+    cache.set(c, "c", ttl=60)
+
+    assert cache.get(b) is None
+    assert cache.get(a) == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_per_endpoint_ttls():
+    cache = ResponseCache(default_ttl=30, ttls={"detail": 3600, "request": 10})
+
+    assert cache.ttl_for("movie/603") == 3600
+    assert cache.ttl_for("/tv/1399") == 3600
+    assert cache.ttl_for("request/5") == 10
+    assert cache.ttl_for("request") == 30
+
+
+def test_invalidate_matches_whole_segments():
+    cache = ResponseCache()
+    cache.set(make_key("GET", "request"), [], ttl=60)
+    cache.set(make_key("GET", "request/1"), {}, ttl=60)
+    cache.set(make_key("GET", "requests-extra"), {}, ttl=60)
+
+    assert cache.invalidate("request") == 2
+    assert len(cache) == 1
+
+
+def test_expired_entry_with_validators_can_be_refreshed(clock):
+    cache = ResponseCache(clock=clock)
+    key = make_key("GET", "movie/603")
+    cache.set(key, {"id": 603}, ttl=10, etag='"abc"')
+
+    clock.now = 11
+    assert cache.get(key) is None
+    stale = cache.get_stale(key)
+    assert stale.validators() == {"If-None-Match": '"abc"'}
+
+    cache.refresh(key, ttl=10)
+    assert cache.get(key) == {"id": 603}
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_expired_entry_without_validators_is_dropped(clock):
+    cache = ResponseCache(clock=clock)
+    key = make_key("GET", "search", {"query": "x"})
+    cache.set(key, [], ttl=1)
+
+    clock.now = 2
+    cache.get(key)
+    assert cache.get_stale(key) is None
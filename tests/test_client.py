@@ -1,7 +1,11 @@
+import asyncio
+import httpx
 import pytest
-from unittest.mock import MagicMock, patch
-from jellyseerr_mcp.client import JellyseerrClient
+from unittest.mock import AsyncMock, MagicMock, patch
+from jellyseerr_mcp.client import AsyncJellyseerrClient, JellyseerrClient
+from jellyseerr_mcp.cache import make_key
 from jellyseerr_mcp.config import AppConfig
+from jellyseerr_mcp.resilience import CircuitOpenError, OverloadedError
 
 @pytest.fixture
 def mock_config():
@@ -14,6 +18,16 @@ def mock_config():
         auth_required_scopes=None,
     )
 
+def _response(status, json=None, headers=None):
+    request = httpx.Request("GET", "http://test.local/api/v1/search")
+    return httpx.Response(status, json=json, headers=headers, request=request)
+
+def _route(responses):
+    """side_effect that answers by (method, endpoint)."""
+    async def handler(method, url, params=None, json=None, **kwargs):
+        return responses[(method, url.split("/api/v1/", 1)[1])]
+    return handler
+
 @pytest.fixture
 def mock_httpx_client():
     with patch("jellyseerr_mcp.client.httpx.Client") as mock:
@@ -30,7 +44,9 @@ def test_client_init(mock_config, mock_httpx_client):
             "Accept": "application/json",
             "Content-Type": "application/json",
         },
-        timeout=10.0
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0),
+        http2=False,
     )
 
 def test_request_success(mock_config, mock_httpx_client):
@@ -64,6 +80,40 @@ def test_search_media(mock_config, mock_httpx_client):
         json=None
     )
 
+def test_search_media_pages_up_to_limit(mock_config, mock_httpx_client):
+    def page(method, url, params=None, json=None):
+        response = MagicMock()
+        number = params.get("page", 1)
+        response.json.return_value = _search_page(number, 5, 20)
+        return response
+
+    mock_instance = mock_httpx_client.return_value
+    mock_instance.request.side_effect = page
+
+    client = JellyseerrClient(mock_config)
+    result = client.search_media("Dune", limit=50)
+
+    assert len(result["results"]) == 50
+    assert [c.kwargs["params"].get("page", 1) for c in mock_instance.request.call_args_list] == [1, 2, 3]
+
+
+def test_search_media_stops_at_short_page(mock_config, mock_httpx_client):
+    def page(method, url, params=None, json=None):
+        response = MagicMock()
+        number = params.get("page", 1)
+        response.json.return_value = _search_page(number, 10, 20 if number == 1 else 4)
+        return response
+
+    mock_instance = mock_httpx_client.return_value
+    mock_instance.request.side_effect = page
+
+    client = JellyseerrClient(mock_config)
+    result = client.search_media("Dune", limit=100)
+
+    assert len(result["results"]) == 24
+    assert mock_instance.request.call_count == 2
+
+
 def test_get_request_details(mock_config, mock_httpx_client):
     mock_response = MagicMock()
     mock_response.json.return_value = {"id": 1}
@@ -79,3 +129,590 @@ def test_get_request_details(mock_config, mock_httpx_client):
         params=None, 
         json=None
     )
+
+@pytest.fixture
+def mock_httpx_async_client():
+    with patch("jellyseerr_mcp.client.httpx.AsyncClient") as mock:
+        mock.return_value.request = AsyncMock()
+        yield mock
+
+@pytest.mark.asyncio
+async def test_async_request_success(mock_config, mock_httpx_async_client):
+    mock_response = _response(200, json={"ok": True})
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.return_value = mock_response
+
+    client = AsyncJellyseerrClient(mock_config)
+    result = await client.request("GET", "test")
+
+    assert result == {"ok": True}
+    mock_instance.request.assert_awaited_with("GET", "http://test.local/api/v1/test", params=None, json=None)
+
+@pytest.mark.asyncio
+async def test_async_request_media_posts_service(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _route({
+        ("GET", "service/radarr"): _response(200, json=[{"id": 3, "is4k": False}, {"id": 7, "is4k": False, "isDefault": True}, {"id": 9, "is4k": True}]),
+        ("GET", "service/sonarr"): _response(200, json=[{"id": 1, "is4k": False, "isDefault": True}]),
+        ("POST", "request"): _response(201, json={"id": 1}),
+    })
+
+    client = AsyncJellyseerrClient(mock_config)
+    result = await client.request_media(42, "movie")
+    await client.request_media(43, "movie", is_4k=True)
+
+    assert result == {"id": 1}
+    posts = [c.kwargs["json"] for c in mock_instance.request.await_args_list if c.args[0] == "POST"]
+    assert posts == [
+        {"mediaId": 42, "mediaType": "movie", "is4k": False, "serverId": 7},
+        {"mediaId": 43, "mediaType": "movie", "is4k": True, "serverId": 9},
+    ]
+    # The service table is loaded once, not per request
+    assert mock_instance.request.await_count == 4
+
+def test_pool_limits_from_config(mock_config, mock_httpx_async_client):
+    mock_config.max_connections = 8
+    mock_config.max_keepalive_connections = 4
+    mock_config.keepalive_expiry = 30.0
+
+    client = AsyncJellyseerrClient(mock_config)
+
+    kwargs = mock_httpx_async_client.call_args.kwargs
+    assert kwargs["limits"] == httpx.Limits(max_connections=8, max_keepalive_connections=4, keepalive_expiry=30.0)
+    stats = client.pool_stats()
+    assert stats["max_connections"] == 8
+    assert stats["in_flight"] == 0
+
+def test_http2_falls_back_without_h2(mock_config, mock_httpx_async_client):
+    mock_config.http2 = True
+    with patch("jellyseerr_mcp.client.importlib.util.find_spec", return_value=None):
+        AsyncJellyseerrClient(mock_config)
+
+    assert mock_httpx_async_client.call_args.kwargs["http2"] is False
+
+@pytest.mark.asyncio
+async def test_async_get_is_cached_until_bypassed(mock_config, mock_httpx_async_client):
+    mock_response = _response(200, json={"id": 603})
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.return_value = mock_response
+
+    client = AsyncJellyseerrClient(mock_config)
+    assert await client.request("GET", "movie/603") == {"id": 603}
+    assert await client.request("get", "/movie/603") == {"id": 603}
+    assert mock_instance.request.await_count == 1
+
+    await client.request("GET", "movie/603", bypass_cache=True)
+    assert mock_instance.request.await_count == 2
+
+@pytest.mark.asyncio
+async def test_async_write_invalidates_resource(mock_config, mock_httpx_async_client):
+    mock_response = _response(200, json={"id": 1})
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.return_value = mock_response
+
+    client = AsyncJellyseerrClient(mock_config)
+    await client.get_request(1)
+    await client.request("POST", "request", json={"mediaId": 1})
+    await client.get_request(1)
+
+    assert mock_instance.request.await_count == 3
+
+@pytest.mark.asyncio
+async def test_async_expired_entry_is_revalidated(mock_config, mock_httpx_async_client):
+    request = httpx.Request("GET", "http://test.local/api/v1/movie/603")
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = [
+        httpx.Response(200, json={"id": 603}, headers={"ETag": '"v1"'}, request=request),
+        httpx.Response(304, request=request),
+    ]
+
+    client = AsyncJellyseerrClient(mock_config)
+    await client.request("GET", "movie/603")
+    client._cache._entries[next(iter(client._cache._entries))].expires_at = 0
+    result = await client.request("GET", "movie/603")
+
+    assert result == {"id": 603}
+    assert mock_instance.request.await_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert client.stats()["cache"]["revalidations"] == 1
+
+@pytest.mark.asyncio
+async def test_async_concurrent_identical_gets_share_one_call(mock_config, mock_httpx_async_client):
+    mock_config.cache_enabled = False
+    mock_response = _response(200, json={"id": 1, "status": 2})
+    mock_instance = mock_httpx_async_client.return_value
+
+    async def slow_request(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    mock_instance.request.side_effect = slow_request
+
+    client = AsyncJellyseerrClient(mock_config)
+    results = await asyncio.gather(*(client.get_request(1) for _ in range(10)))
+
+    assert results == [{"id": 1, "status": 2}] * 10
+    assert mock_instance.request.await_count == 1
+
+@pytest.mark.asyncio
+async def test_async_get_retries_transient_failures(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = [
+        httpx.ConnectError("refused"),
+        _response(503, headers={"Retry-After": "0"}),
+        _response(200, json={"results": []}),
+    ]
+
+    client = AsyncJellyseerrClient(mock_config)
+    with patch("jellyseerr_mcp.client.asyncio.sleep", new=AsyncMock()):
+        result = await client.search_media("Test")
+
+    assert result == {"results": []}
+    assert client.stats()["retries"] == {"retries": 2, "giveups": 0}
+
+@pytest.mark.asyncio
+async def test_async_post_is_retried_only_with_idempotency_key(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = [_response(502), _response(502), _response(201, json={"id": 1})]
+
+    client = AsyncJellyseerrClient(mock_config)
+    with patch("jellyseerr_mcp.client.asyncio.sleep", new=AsyncMock()):
+        with pytest.raises(RuntimeError, match="502"):
+            await client.request("POST", "request", json={"mediaId": 1})
+        result = await client.request("POST", "request", json={"mediaId": 1}, idempotency_key="movie-1")
+
+    assert result == {"id": 1}
+    assert mock_instance.request.await_args.kwargs["headers"] == {"Idempotency-Key": "movie-1"}
+
+@pytest.mark.asyncio
+async def test_async_open_breaker_fails_fast_or_serves_stale(mock_config, mock_httpx_async_client):
+    mock_config.retry_max_attempts = 1
+    mock_config.breaker_min_calls = 1
+    mock_config.breaker_window = 1
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = [
+        _response(200, json={"id": 603}, headers={"ETag": '"v1"'}),
+        _response(503),
+    ]
+
+    client = AsyncJellyseerrClient(mock_config)
+    await client.request("GET", "movie/603")
+    with pytest.raises(RuntimeError, match="503"):
+        await client.request("GET", "movie/604")
+    assert client.stats()["breaker"]["state"] == "open"
+
+    # Expired entry is served while the breaker is open, without touching the network
+    next(iter(client._cache._entries.values())).expires_at = 0
+    assert await client.request("GET", "movie/603") == {"id": 603}
+    with pytest.raises(CircuitOpenError):
+        await client.request("GET", "movie/605")
+    assert mock_instance.request.await_count == 2
+
+@pytest.mark.asyncio
+async def test_async_slow_get_is_hedged(mock_config, mock_httpx_async_client):
+    mock_config.hedge_enabled = True
+    mock_config.hedge_min_delay = 0.01
+    mock_config.hedge_max_ratio = 1.0
+    mock_config.cache_enabled = False
+    mock_instance = mock_httpx_async_client.return_value
+    calls = 0
+
+    async def first_slow(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1)
+            return _response(200, json={"from": "first"})
+        return _response(200, json={"from": "hedge"})
+
+    mock_instance.request.side_effect = first_slow
+
+    client = AsyncJellyseerrClient(mock_config)
+    for _ in range(20):
+        client._latency.record("search", 0.01)
+    result = await client.request("GET", "search", params={"query": "x"})
+
+    assert result == {"from": "hedge"}
+    assert client.stats()["hedging"] == {"requests": 1, "hedges": 1, "hedge_wins": 1}
+
+@pytest.mark.asyncio
+async def test_async_raw_write_skips_decoding(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.return_value = _response(201, json={"id": 1})
+
+    client = AsyncJellyseerrClient(mock_config)
+    with patch("jellyseerr_mcp.client.loads") as loads:
+        result = await client.request("POST", "request", json={"mediaId": 1}, raw=True)
+
+    assert result == '{"id":1}'
+    loads.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_raw_get_skips_decoding_when_not_cached(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.return_value = _response(200, json={"id": 603})
+
+    client = AsyncJellyseerrClient(mock_config)
+    with patch("jellyseerr_mcp.client.loads") as loads:
+        result = await client.request("GET", "movie/603", bypass_cache=True, raw=True)
+
+    assert result == '{"id":603}'
+    loads.assert_not_called()
+
+    # An empty body (e.g. 204) is None rather than an empty string
+    mock_instance.request.return_value = _response(204)
+    assert await client.request("DELETE", "request/1", raw=True) is None
+
+def _search_page(page, total_pages, count):
+    return {
+        "page": page,
+        "totalPages": total_pages,
+        "totalResults": total_pages * 20,
+        "results": [{"id": page * 100 + i} for i in range(count)],
+    }
+
+@pytest.mark.asyncio
+async def test_async_search_media_fetches_pages_concurrently_up_to_limit(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    in_flight = peak = 0
+
+    async def paged(method, url, params=None, json=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _response(200, json=_search_page(params.get("page", 1), 10, 20))
+
+    mock_instance.request.side_effect = paged
+
+    client = AsyncJellyseerrClient(mock_config)
+    result = await client.search_media("Matrix", limit=50)
+
+    assert [r["id"] for r in result["results"]] == [100 + i for i in range(20)] + [200 + i for i in range(20)] + [300 + i for i in range(10)]
+    assert mock_instance.request.await_count == 3
+    assert peak == 3
+
+@pytest.mark.asyncio
+async def test_async_search_media_stops_at_last_page(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.return_value = _response(200, json=_search_page(1, 1, 7))
+
+    client = AsyncJellyseerrClient(mock_config)
+    result = await client.search_media("Rare", limit=60)
+
+    assert len(result["results"]) == 7
+    # Pages 2-3 go out speculatively in the first round trip; no further pages are requested
+    assert mock_instance.request.await_count == 3
+
+def _list_page(skip, take, total):
+    return {
+        "pageInfo": {"pages": -(-total // take), "pageSize": take, "results": total, "page": skip // take + 1},
+        "results": [{"id": i} for i in range(skip, min(skip + take, total))],
+    }
+
+def test_paginate_walks_take_skip_pages(mock_config, mock_httpx_client):
+    mock_instance = mock_httpx_client.return_value
+    mock_instance.request.side_effect = lambda method, url, params=None, json=None: MagicMock(
+        json=MagicMock(return_value=_list_page(params["skip"], params["take"], 5))
+    )
+
+    client = JellyseerrClient(mock_config)
+    items = list(client.paginate("request", params={"filter": "all"}, page_size=2))
+
+    assert [item["id"] for item in items] == [0, 1, 2, 3, 4]
+    assert mock_instance.request.call_count == 3
+    mock_instance.request.assert_called_with(
+        "GET", "http://test.local/api/v1/request", params={"filter": "all", "take": 2, "skip": 4}, json=None
+    )
+
+@pytest.mark.asyncio
+async def test_async_paginate_prefetches_next_page(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    requested = []
+
+    async def paged(method, url, params=None, json=None):
+        requested.append(params["skip"])
+        return _response(200, json=_list_page(params["skip"], params["take"], 6))
+
+    mock_instance.request.side_effect = paged
+
+    client = AsyncJellyseerrClient(mock_config)
+    pages = client.paginate("media", page_size=3)
+    first = await pages.__anext__()
+    await asyncio.sleep(0)
+
+    # The second page is already on its way while the first is being consumed
+    assert first == {"id": 0}
+    assert requested == [0, 3]
+    rest = [item async for item in pages]
+    assert [item["id"] for item in rest] == [1, 2, 3, 4, 5]
+    assert requested == [0, 3]
+
+@pytest.mark.asyncio
+async def test_async_request_media_reuses_known_details(mock_config, mock_httpx_async_client):
+    details = {"id": 42, "title": "Movie", "services": [{"slug": "radarr", "id": 7}], "mediaInfo": {"status": 1}}
+    created = {"id": 1, "status": 1, "media": {"status": 2, "tmdbId": 42}}
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _route({
+        ("GET", "service/radarr"): _response(403),
+        ("GET", "service/sonarr"): _response(403),
+        ("GET", "movie/42"): _response(200, json=details),
+        ("POST", "request"): _response(201, json=created),
+    })
+
+    client = AsyncJellyseerrClient(mock_config)
+    await client.get_media_details("movie", 42)
+    await client.request_media(42, "movie")
+    await client.request_media(42, "movie", force=True)
+
+    # Without a service table, the services come from one details fetch reused by both POSTs
+    calls = [(c.args[0], c.args[1].rsplit("/v1/", 1)[1]) for c in mock_instance.request.await_args_list]
+    assert calls.count(("GET", "movie/42")) == 1
+    assert calls.count(("POST", "request")) == 2
+    assert len(calls) == 5
+    assert client._known_media("movie", 42)["mediaInfo"] == {"status": 2, "tmdbId": 42}
+    assert client._cache.get(make_key("GET", "movie/42")) is None
+
+@pytest.mark.asyncio
+async def test_async_request_media_bulk_reports_per_item_results(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _route({
+        ("GET", "service/radarr"): _response(200, json=[{"id": 7, "is4k": False}]),
+        ("GET", "service/sonarr"): _response(200, json=[]),
+        ("POST", "request"): _response(201, json={"id": 1}),
+        ("GET", "tv/1399"): _response(200, json={"id": 1399, "services": []}),
+    })
+
+    client = AsyncJellyseerrClient(mock_config)
+    results = await client.request_media_bulk([(603, "movie", False), (1399, "tv", False)])
+
+    assert results[0] == {"media_id": 603, "media_type": "movie", "is_4k": False, "ok": True, "request": {"id": 1}}
+    assert results[1]["ok"] is False
+    assert "sonarr" in results[1]["error"]
+
+def _request_list(total):
+    async def handler(method, url, params=None, json=None, **kwargs):
+        endpoint = url.split("/api/v1/", 1)[1]
+        if endpoint.startswith("request/"):
+            request_id = int(endpoint.split("/")[1])
+            if request_id >= total:
+                return _response(404, json={"message": "Not found"})
+            return _response(200, json={"id": request_id})
+        skip, take = params["skip"], params["take"]
+        return _response(200, json=_list_page(skip, take, total))
+    return handler
+
+@pytest.mark.asyncio
+async def test_async_get_requests_small_batch_fetches_by_id(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _request_list(1000)
+
+    client = AsyncJellyseerrClient(mock_config)
+    result = await client.get_requests([5, 7, 5, 2000])
+
+    assert result["strategy"] == "by_id"
+    assert [r["request_id"] for r in result["results"]] == [5, 7, 2000]
+    assert [r["ok"] for r in result["results"]] == [True, True, False]
+    assert mock_instance.request.await_count == 3
+
+@pytest.mark.asyncio
+async def test_async_get_requests_large_batch_scans_list(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _request_list(250)
+
+    client = AsyncJellyseerrClient(mock_config)
+    ids = list(range(100, 120)) + [240]
+    result = await client.get_requests(ids)
+
+    assert result["strategy"] == "scan"
+    assert all(r["ok"] for r in result["results"])
+    # Three list pages instead of 21 single fetches
+    assert mock_instance.request.await_count == 3
+    # Found requests now answer get_request from the cache
+    await client.get_request(240)
+    assert mock_instance.request.await_count == 3
+
+@pytest.mark.asyncio
+async def test_async_get_requests_prefers_by_id_when_list_is_huge(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _request_list(100000)
+
+    client = AsyncJellyseerrClient(mock_config)
+    result = await client.get_requests(list(range(5000, 5010)))
+
+    assert result["strategy"] == "by_id"
+    assert all(r["ok"] for r in result["results"])
+    # One probe page plus ten single fetches
+    assert mock_instance.request.await_count == 11
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "media_info, is_4k, state",
+    [
+        ({"status": 5}, False, "available"),
+        ({"status": 3}, False, "processing"),
+        ({"status": 1, "requests": [{"status": 1, "is4k": False}]}, False, "requested"),
+        ({"status": 5, "status4k": 1}, True, None),
+        ({"status": 1, "requests": [{"status": 3, "is4k": False}]}, False, None),
+    ],
+)
+async def test_async_request_media_skips_duplicates_from_cached_state(mock_config, mock_httpx_async_client, media_info, is_4k, state):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _route({
+        ("GET", "search"): _response(200, json={"page": 1, "totalPages": 1, "results": [{"id": 42, "mediaType": "movie", "mediaInfo": media_info}]}),
+        ("GET", "service/radarr"): _response(200, json=[{"id": 7, "is4k": False}, {"id": 9, "is4k": True}]),
+        ("GET", "service/sonarr"): _response(200, json=[]),
+        ("POST", "request"): _response(201, json={"id": 1}),
+    })
+
+    client = AsyncJellyseerrClient(mock_config)
+    await client.search_media("Movie")
+    result = await client.request_media(42, "movie", is_4k=is_4k)
+
+    posted = any(c.args[0] == "POST" for c in mock_instance.request.await_args_list)
+    if state is None:
+        assert posted
+    else:
+        assert result["duplicate"] is True and result["state"] == state
+        assert not posted
+        assert client.stats()["duplicates_avoided"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_request_media_checks_fetched_details_for_duplicates(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _route({
+        ("GET", "service/radarr"): _response(403),
+        ("GET", "service/sonarr"): _response(403),
+        ("GET", "movie/7"): _response(200, json={"id": 7, "services": [{"slug": "radarr", "id": 1}], "mediaInfo": {"status": 5}}),
+        ("POST", "request"): _response(201, json={"id": 1}),
+    })
+
+    client = AsyncJellyseerrClient(mock_config)
+    # Nothing known up front and no service table, so the details are fetched to build the payload
+    result = await client.request_media(7, "movie")
+
+    assert result["duplicate"] is True and result["state"] == "available"
+    assert not any(c.args[0] == "POST" for c in mock_instance.request.await_args_list)
+    assert client.stats()["duplicates_avoided"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_other_writes_forget_known_media_state(mock_config, mock_httpx_async_client):
+    pending = {"status": 2, "requests": [{"id": 5, "status": 1, "is4k": False}]}
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _route({
+        ("GET", "search"): _response(200, json={"page": 1, "totalPages": 1, "results": [{"id": 7, "mediaType": "movie", "mediaInfo": pending}]}),
+        ("DELETE", "request/5"): _response(204),
+        ("GET", "service/radarr"): _response(200, json=[{"id": 1, "is4k": False}]),
+        ("GET", "service/sonarr"): _response(200, json=[]),
+        ("POST", "request"): _response(201, json={"id": 6}),
+    })
+
+    client = AsyncJellyseerrClient(mock_config)
+    await client.search_media("Movie")
+    # Deleting the pending request elsewhere (e.g. raw_request) makes the known state stale
+    await client.request("DELETE", "request/5", raw=True)
+    result = await client.request_media(7, "movie")
+
+    assert result == {"id": 6}
+    assert any(c.args[0] == "POST" for c in mock_instance.request.await_args_list)
+
+
+@pytest.mark.asyncio
+async def test_async_slow_upstream_sheds_uncached_calls_but_serves_cache(mock_config, mock_httpx_async_client):
+    mock_config.admission_max_latency = 1.0
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.return_value = _response(200, json={"id": 603}, headers={"ETag": '"v1"'})
+
+    client = AsyncJellyseerrClient(mock_config)
+    await client.request("GET", "movie/603")
+    for _ in range(10):
+        client._admission.record("movie", 30.0)
+
+    # Fresh and expired cache entries are still answered; new upstream reads are rejected
+    assert await client.request("GET", "movie/603") == {"id": 603}
+    next(iter(client._cache._entries.values())).expires_at = 0
+    assert await client.request("GET", "movie/603") == {"id": 603}
+    with pytest.raises(OverloadedError, match="retry in"):
+        await client.request("GET", "movie/604")
+    assert mock_instance.request.await_count == 1
+    assert client.stats()["admission"]["shedding"] == ["movie"]
+
+    # Other kinds and writes still go through
+    await client.request("GET", "search", params={"query": "dune"})
+    await client.request("POST", "request", json={"mediaId": 1})
+    assert mock_instance.request.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_async_long_operations_report_progress(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = _request_list(250)
+    updates = []
+
+    async def progress(done, total):
+        updates.append((done, total))
+
+    client = AsyncJellyseerrClient(mock_config)
+    await client.get_requests(list(range(100, 120)) + [240, 9999], progress=progress)
+
+    # The probe page holds none of the ids; each one found by the scan moves progress forward
+    assert updates[0] == (0, 22) and updates[-1] == (22, 22)
+    assert [done for done, _ in updates] == sorted(done for done, _ in updates)
+
+    updates.clear()
+    mock_instance.request.side_effect = lambda method, url, params=None, json=None: _response(
+        200, json=_search_page(params.get("page", 1), 10, 20)
+    )
+    await client.search_media("Matrix", limit=50, progress=progress)
+    assert updates[-1] == (50, 50)
+
+@pytest.mark.asyncio
+async def test_async_new_client_is_warm_from_disk_cache(mock_config, mock_httpx_async_client, tmp_path):
+    mock_config.cache_path = str(tmp_path / "cache.db")
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.return_value = _response(200, json={"id": 603})
+    mock_instance.aclose = AsyncMock()
+
+    first = AsyncJellyseerrClient(mock_config)
+    await first.request("GET", "movie/603")
+    await first.aclose()
+
+    second = AsyncJellyseerrClient(mock_config)
+    assert await second.request("GET", "movie/603") == {"id": 603}
+    assert mock_instance.request.await_count == 1
+    await second.aclose()
+
+@pytest.mark.asyncio
+async def test_async_search_media_short_first_page_stops_speculation(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+    mock_instance.request.side_effect = lambda method, url, params=None, json=None: _response(
+        200, json=_search_page(1, 1, 3) if params.get("page", 1) == 1 else {"results": []}
+    )
+
+    client = AsyncJellyseerrClient(mock_config)
+    result = await client.search_media("Obscure", limit=400)
+
+    assert len(result["results"]) == 3
+    # One concurrent round at most, not the 20 pages the limit implies
+    assert mock_instance.request.await_count <= mock_config.page_concurrency
+
+@pytest.mark.asyncio
+async def test_async_search_media_limit_is_capped(mock_config, mock_httpx_async_client):
+    mock_instance = mock_httpx_async_client.return_value
+
+    async def paged(method, url, params=None, json=None):
+        page = params.get("page", 1)
+        if page > 500:
+            return _response(422, json={"message": "page must be less than or equal to 500"})
+        return _response(200, json=_search_page(page, 1000, 20))
+
+    mock_instance.request.side_effect = paged
+
+    client = AsyncJellyseerrClient(mock_config)
+    result = await client.search_media("the", limit=20000)
+
+    assert len(result["results"]) == 500
+    assert mock_instance.request.await_count == 25
@@ -0,0 +1,277 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from jellyseerr_mcp.concurrency import (
+    BatchAborted,
+    FairScheduler,
+    HedgeBudget,
+    LatencyTracker,
+    RateLimitExceeded,
+    SingleFlight,
+    TokenBucket,
+    run_bounded,
+)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"id": 1}
+
+    waiters = [asyncio.create_task(flight.do("request/1", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert results == [{"id": 1}] * 5
+    assert flight.stats() == {"in_flight": 0, "coalesced": 4}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_and_forgets_key():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", fetch))
+    second = asyncio.create_task(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_queues(clock):
+    bucket = TokenBucket(rate=10, burst=2, max_wait=1.0, clock=clock)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    with patch("jellyseerr_mcp.concurrency.asyncio.sleep", new=fake_sleep):
+        for _ in range(4):
+            await bucket.acquire()
+
+    assert sleeps == pytest.approx([0.1, 0.2])
+    assert bucket.stats()["waited"] == 2
+    assert bucket.stats()["max_wait"] == pytest.approx(0.2)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_rejects_past_max_wait_and_refills(clock):
+    bucket = TokenBucket(rate=1, burst=1, max_wait=0.5, clock=clock)
+
+    await bucket.acquire()
+    with pytest.raises(RateLimitExceeded):
+        await bucket.acquire()
+    assert bucket.stats()["rejected"] == 1
+
+    clock.now = 1.0
+    await bucket.acquire()
+
+
+@pytest.mark.asyncio
+async def test_disabled_token_bucket_never_waits():
+    bucket = TokenBucket(rate=0, burst=1, max_wait=0)
+    for _ in range(100):
+        await bucket.acquire()
+
+
+def test_latency_percentile_needs_min_samples():
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for i in range(9):
+        tracker.record("search", i / 10)
+    assert tracker.percentile("search", 0.9) is None
+
+    tracker.record("search", 0.9)
+    assert tracker.percentile("search", 0.9) == 0.9
+    assert tracker.percentile("movie", 0.9) is None
+
+
+def test_hedge_budget_caps_extra_load():
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("search", 0.2)
+    budget = HedgeBudget(percentile=0.95, min_delay=0.05, max_ratio=0.1)
+
+    for _ in range(10):
+        assert budget.delay(tracker, "search") == 0.2
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+
+def test_hedge_budget_does_not_bank_calm_traffic():
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("search", 0.2)
+    budget = HedgeBudget(max_ratio=0.1)
+    for _ in range(10_000):
+        budget.delay(tracker, "search")
+
+    # The upstream turns slow and every request wants a hedge
+    hedged = 0
+    for _ in range(1_000):
+        budget.delay(tracker, "search")
+        hedged += budget.try_acquire()
+    assert hedged <= 101
+
+
+@pytest.mark.asyncio
+async def test_run_bounded_keeps_order_limits_concurrency_and_collects_errors():
+    in_flight = peak = 0
+
+    def make(i):
+        async def call():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (5 - i))
+            in_flight -= 1
+            if i == 2:
+                raise RuntimeError("boom")
+            return i
+        return call
+
+    results = await run_bounded([make(i) for i in range(5)], limit=2)
+
+    assert results[:2] == [0, 1] and results[3:] == [3, 4]
+    assert isinstance(results[2], RuntimeError)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_run_bounded_stop_on_error_skips_remaining():
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def ok():
+        return "ok"
+
+    results = await run_bounded([fail, ok, ok], limit=1, stop_on_error=True)
+
+    assert isinstance(results[0], RuntimeError)
+    assert all(isinstance(r, BatchAborted) for r in results[1:])
+
+
+@pytest.mark.asyncio
+async def test_fair_scheduler_serves_waiting_sessions_round_robin():
+    scheduler = FairScheduler(limit=1)
+    order = []
+    gate = asyncio.Event()
+
+    async def call(session, n):
+        async with scheduler.slot(session):
+            order.append((session, n))
+            await gate.wait()
+
+    # The noisy session queues three calls before the quiet one asks for anything
+    tasks = [asyncio.ensure_future(call("noisy", n)) for n in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.ensure_future(call("quiet", 0)))
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*tasks)
+
+    assert order == [("noisy", 0), ("noisy", 1), ("quiet", 0), ("noisy", 2)]
+    stats = scheduler.stats()
+    assert stats["in_use"] == 0
+    assert stats["sessions"][scheduler.label("noisy")]["calls"] == 3
+
+
+@pytest.mark.asyncio
+async def test_fair_scheduler_caps_in_flight_per_session():
+    scheduler = FairScheduler(limit=10, per_session=2)
+    running = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+
+    async def call(session):
+        async with scheduler.slot(session):
+            running[session] += 1
+            peak[session] = max(peak[session], running[session])
+            await asyncio.sleep(0.01)
+            running[session] -= 1
+
+    await asyncio.gather(*(call("a") for _ in range(6)), call("b"))
+
+    assert peak == {"a": 2, "b": 1}
+    assert scheduler.stats()["sessions"][scheduler.label("a")]["max_wait"] > 0
+
+
+@pytest.mark.asyncio
+async def test_fair_scheduler_does_not_cap_unidentified_callers_together():
+    scheduler = FairScheduler(limit=10, per_session=1)
+    running = peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with scheduler.slot(None):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(4)))
+
+    assert peak == 4
+    assert list(scheduler.stats()["sessions"]) == ["unidentified"]
+    assert scheduler.stats()["sessions"]["unidentified"]["calls"] == 4
+
+
+@pytest.mark.asyncio
+async def test_fair_scheduler_stats_do_not_reveal_session_keys():
+    scheduler = FairScheduler(limit=1)
+    async with scheduler.slot("session:0f3c9a7e-secret"):
+        pass
+    async with scheduler.slot("forwarded:10.0.0.7"):
+        pass
+
+    sessions = scheduler.stats()["sessions"]
+    assert "0f3c9a7e-secret" not in str(sessions)
+    assert "10.0.0.7" not in str(sessions)
+    # The kind stays readable, and the same key always gets the same label
+    assert scheduler.label("session:0f3c9a7e-secret") in sessions
+    assert all(label.startswith(("session:", "forwarded:")) for label in sessions)
+
+
+@pytest.mark.asyncio
+async def test_fair_scheduler_cancelled_waiter_frees_its_place():
+    scheduler = FairScheduler(limit=1)
+    await scheduler.acquire("a")
+    waiter = asyncio.ensure_future(scheduler.acquire("b"))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["queued"] == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    scheduler.release("a")
+
+    assert scheduler.stats()["queued"] == 0
+    assert scheduler.stats()["in_use"] == 0
@@ -0,0 +1,154 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from jellyseerr_mcp.cache import ResponseCache, make_key
+from jellyseerr_mcp.diskcache import DiskCache
+
+
+@pytest.mark.asyncio
+async def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.db")
+    key = make_key("GET", "movie/1")
+    disk = DiskCache(path)
+    disk.set(key, {"id": 1, "title": "Dune"}, ttl=60, etag='"v1"')
+    disk.close()
+
+    value, remaining, etag, _ = await DiskCache(path).get(key)
+    assert value == {"id": 1, "title": "Dune"}
+    assert 0 < remaining <= 60
+    assert etag == '"v1"'
+
+
+def test_uses_wal_mode(tmp_path):
+    path = str(tmp_path / "cache.db")
+    DiskCache(path).close()
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+@pytest.mark.asyncio
+async def test_evicts_entries_closest_to_expiry(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"), max_entries=2, evict_every=3)
+    short, long, longest = (make_key("GET", f"movie/{i}") for i in range(3))
+    disk.set(short, "short", ttl=10)
+    disk.set(long, "long", ttl=100)
+    disk.set(longest, "longest", ttl=1000)
+    await disk.flush()
+
+    assert await disk.get(short) is None
+    assert (await disk.get(long))[0] == "long"
+    assert disk.stats()["evictions"] == 1
+    assert disk.stats()["size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_matches_whole_segments(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    for endpoint in ("request", "request/1", "requests"):
+        disk.set(make_key("GET", endpoint), endpoint, ttl=60)
+
+    disk.invalidate("request")
+    await disk.flush()
+
+    assert await disk.get(make_key("GET", "request")) is None
+    assert await disk.get(make_key("GET", "request/1")) is None
+    assert (await disk.get(make_key("GET", "requests")))[0] == "requests"
+
+
+@pytest.mark.asyncio
+async def test_locked_database_does_not_block_the_event_loop(tmp_path):
+    path = str(tmp_path / "cache.db")
+    disk = DiskCache(path, busy_timeout=0.5)
+    key = make_key("GET", "movie/1")
+    disk.set(key, "cached", ttl=60)
+    await disk.flush()
+
+    # Another process holds the write lock
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.ensure_future(ticker())
+    started = time.monotonic()
+    for i in range(3):
+        disk.set(make_key("GET", f"movie/{i + 2}"), i, ttl=60)
+        assert (await disk.get(key))[0] == "cached"
+    elapsed = time.monotonic() - started
+    await asyncio.sleep(0.1)
+    task.cancel()
+    other.rollback()
+    await disk.flush()
+
+    # WAL readers don't wait for the writer, and queued writes never ran on the loop
+    assert elapsed < 0.2
+    assert ticks >= 5
+    disk.close()
+
+
+@pytest.mark.asyncio
+async def test_response_cache_warms_from_another_process(tmp_path):
+    path = str(tmp_path / "cache.db")
+    key = make_key("GET", "search", {"query": "dune"})
+    first = DiskCache(path)
+    ResponseCache(backend=first).set(key, {"results": []}, ttl=60)
+    first.close()
+
+    # A second process starts with an empty memory tier but the same file
+    fresh = ResponseCache(backend=DiskCache(path))
+    assert fresh.get(key) is None
+    entry = await fresh.load(key)
+    assert fresh.is_fresh(entry)
+    assert fresh.get(key) == {"results": []}
+    assert fresh.stats()["disk"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_response_cache_mirrors_expiry_and_invalidation(tmp_path, clock):
+    disk = DiskCache(str(tmp_path / "cache.db"), clock=clock)
+    key = make_key("GET", "request/1")
+    ResponseCache(backend=disk).set(key, {"id": 1}, ttl=10, etag='"a"')
+    await disk.flush()
+
+    clock.now += 11
+    other = ResponseCache(backend=disk)
+    entry = await other.load(key)
+    assert not other.is_fresh(entry)
+    # Expired, but still usable for revalidation
+    assert other.get_stale(key).validators() == {"If-None-Match": '"a"'}
+
+    other.invalidate("request")
+    await disk.flush()
+    assert await disk.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_response_cache_sees_other_process_invalidation(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    key = make_key("GET", "movie/7")
+    first = ResponseCache(backend=DiskCache(path), clock=clock, memory_ttl=5)
+    first.set(key, {"mediaInfo": None}, ttl=3600)
+    await first._backend.flush()
+    second = ResponseCache(backend=DiskCache(path), clock=clock, memory_ttl=5)
+    await second.load(key)
+    assert second.get(key) == {"mediaInfo": None}
+
+    # A request in the first process invalidates the details
+    first.invalidate("movie/7")
+    await first._backend.flush()
+    assert second.get(key) == {"mediaInfo": None}
+
+    # Past memory_ttl, the second process re-reads the file and finds nothing
+    clock.now += 5
+    entry = second.get_stale(key)
+    assert second.get(key) is None
+    assert second.needs_load(entry)
+    assert await second.load(key) is None
+    assert second.get_stale(key) is None
@@ -0,0 +1,15 @@
+from jellyseerr_mcp import jsoncodec
+
+
+def test_round_trip_is_compact():
+    data = {"results": [{"id": 1, "title": "Amélie"}], "page": 1}
+
+    encoded = jsoncodec.dumps(data)
+
+    assert isinstance(encoded, str)
+    assert " " not in encoded.replace("Amélie", "")
+    assert jsoncodec.loads(encoded.encode()) == data
+
+
+def test_backend_is_reported():
+    assert jsoncodec.BACKEND in {"orjson", "msgspec", "json"}
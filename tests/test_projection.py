@@ -0,0 +1,48 @@
+from jellyseerr_mcp.projection import project, project_results
+
+
+SEARCH_RESPONSE = {
+    "page": 1,
+    "totalPages": 3,
+    "totalResults": 55,
+    "results": [
+        {
+            "id": 603,
+            "mediaType": "movie",
+            "title": "The Matrix",
+            "releaseDate": "1999-03-30",
+            "overview": "A long overview...",
+            "backdropPath": "/x.jpg",
+            "popularity": 81.123,
+            "mediaInfo": {"status": 5, "requests": [{"id": 1}]},
+        },
+        {"id": 1399, "mediaType": "tv", "name": "Game of Thrones", "firstAirDate": "2011-04-17"},
+    ],
+}
+
+
+def test_default_projection_is_compact():
+    trimmed = project_results(SEARCH_RESPONSE)
+
+    assert trimmed == {
+        "page": 1,
+        "totalPages": 3,
+        "totalResults": 55,
+        "results": [
+            {"id": 603, "mediaType": "movie", "title": "The Matrix", "releaseDate": "1999-03-30", "mediaInfo": {"status": 5}},
+            {"id": 1399, "mediaType": "tv", "name": "Game of Thrones", "firstAirDate": "2011-04-17"},
+        ],
+    }
+
+
+def test_custom_fields_and_wildcard():
+    assert project_results(SEARCH_RESPONSE, ["id", "overview"])["results"][0] == {"id": 603, "overview": "A long overview..."}
+    assert project_results(SEARCH_RESPONSE, ["*"]) is SEARCH_RESPONSE
+
+
+def test_project_does_not_mutate_source():
+    item = {"mediaInfo": {"status": 5, "requests": []}}
+
+    project(item, ["mediaInfo.status"])
+
+    assert item == {"mediaInfo": {"status": 5, "requests": []}}
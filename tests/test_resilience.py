@@ -0,0 +1,130 @@
+import httpx
+import pytest
+
+from jellyseerr_mcp.resilience import (
+    AdmissionController,
+    CircuitBreaker,
+    OverloadedError,
+    RetryPolicy,
+    is_upstream_failure,
+    parse_retry_after,
+)
+
+
+def _status_error(status, headers=None):
+    request = httpx.Request("GET", "http://test.local/api/v1/search")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_parse_retry_after_seconds_and_date():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=lambda: 1445412480.0) == 10.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_is_bounded_and_jittered():
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=3.0)
+    error = httpx.ConnectError("refused")
+
+    for attempt in range(1, 5):
+        delay = policy.next_delay(attempt, error)
+        assert 0 <= delay <= min(3.0, 2 ** (attempt - 1))
+    assert policy.next_delay(5, error) is None
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 409])
+def test_client_errors_are_not_retried(status):
+    assert RetryPolicy().next_delay(1, _status_error(status)) is None
+
+
+def test_retry_after_is_honoured_within_cap():
+    policy = RetryPolicy(max_delay=10.0)
+
+    assert policy.next_delay(1, _status_error(429, {"Retry-After": "2"})) == 2.0
+    assert policy.next_delay(1, _status_error(503, {"Retry-After": "60"})) is None
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_through_half_open(clock):
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, window=4, open_seconds=30, clock=clock)
+
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record_success() if ok else breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now = 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens_breaker(clock):
+    breaker = CircuitBreaker(min_calls=1, window=1, open_seconds=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["retry_in"] == 10.0
+
+
+def test_client_errors_do_not_count_as_upstream_failures():
+    assert not is_upstream_failure(_status_error(404))
+    assert is_upstream_failure(_status_error(503))
+    assert is_upstream_failure(httpx.ReadTimeout("slow"))
+
+
+def test_admission_sheds_on_slow_upstream_until_latency_decays(clock):
+    admission = AdmissionController(max_latency=2.0, min_samples=3, half_life=5.0, clock=clock)
+    for _ in range(3):
+        admission.check("movie", queued=0)
+        admission.record("movie", 8.0)
+
+    with pytest.raises(OverloadedError) as excinfo:
+        admission.check("movie", queued=0)
+    # 8s halves to 2s after two half-lives
+    assert excinfo.value.retry_after == pytest.approx(10.0)
+    assert admission.stats()["shedding"] == ["movie"]
+
+    clock.now = 10.5
+    admission.check("movie", queued=0)
+    assert admission.stats()["shed"] == 1
+
+
+def test_admission_waits_for_enough_samples(clock):
+    admission = AdmissionController(max_latency=2.0, min_samples=3, clock=clock)
+    admission.record("movie", 60.0)
+    admission.record("movie", 60.0)
+
+    # One or two slow calls are not a trend yet
+    admission.check("movie", queued=0)
+    assert admission.stats()["latency"] == {}
+
+
+def test_admission_tracks_latency_per_kind(clock):
+    admission = AdmissionController(max_latency=2.0, min_samples=1, clock=clock)
+    admission.record("search", 30.0)
+    admission.record("movie", 0.1)
+
+    with pytest.raises(OverloadedError, match="'search'"):
+        admission.check("search", queued=0)
+    admission.check("movie", queued=0)
+
+
+def test_admission_sheds_on_queue_depth():
+    admission = AdmissionController(max_queue=3)
+    admission.check("movie", queued=2)
+    with pytest.raises(OverloadedError, match="3 upstream calls queued"):
+        admission.check("movie", queued=3)
+
+
+def test_disabled_admission_never_sheds():
+    admission = AdmissionController(min_samples=1)
+    admission.record("movie", 60.0)
+    admission.check("movie", queued=10_000)
@@ -1,6 +1,24 @@
+import json
+
 import pytest
-from unittest.mock import MagicMock, patch
-from jellyseerr_mcp.server import ping, search_media, request_media, get_request, raw_request
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+from jellyseerr_mcp.config import AppConfig
+from jellyseerr_mcp.server import (
+    MediaRequestItem,
+    RawRequestItem,
+    _serve,
+    get_media_details,
+    get_request,
+    get_requests,
+    mcp,
+    ping,
+    raw_batch,
+    raw_request,
+    request_media,
+    request_media_bulk,
+    run,
+    search_media,
+)
 
 # Mock the logger to avoid cluttering test output
 @pytest.fixture(autouse=True)
@@ -11,7 +29,7 @@ def mock_logger():
 # Mock the global _client in server.py
 @pytest.fixture
 def mock_client():
-    with patch("jellyseerr_mcp.server._client") as mock:
+    with patch("jellyseerr_mcp.server._client", new_callable=AsyncMock) as mock:
         yield mock
 
 def test_ping():
@@ -21,45 +39,225 @@ def test_ping():
         "service": "jellyseerr-mcp",
     }
 
-def test_search_media_success(mock_client):
+@pytest.mark.asyncio
+async def test_search_media_success(mock_client):
     # Setup mock return value
     expected_data = {"results": [{"id": 1, "title": "Test Movie"}]}
     mock_client.search_media.return_value = expected_data
     
     # Call the function
-    result = search_media(query="Test Movie")
+    result = await search_media(query="Test Movie")
     
     # Assertions
-    assert result == expected_data
-    mock_client.search_media.assert_called_once_with("Test Movie")
+    assert json.loads(result) == expected_data
+    mock_client.search_media.assert_awaited_once_with("Test Movie", limit=20, progress=ANY)
 
-def test_request_media_success(mock_client):
+@pytest.mark.asyncio
+async def test_request_media_success(mock_client):
     expected_data = {"id": 1, "status": "pending"}
     mock_client.request_media.return_value = expected_data
     
-    result = request_media(media_id=123, media_type="movie")
+    result = await request_media(media_id=123, media_type="movie")
     
-    assert result == expected_data
-    mock_client.request_media.assert_called_once_with(media_id=123, media_type="movie")
+    assert json.loads(result) == expected_data
+    mock_client.request_media.assert_awaited_once_with(media_id=123, media_type="movie", force=False)
 
-def test_get_request_success(mock_client):
+@pytest.mark.asyncio
+async def test_get_request_success(mock_client):
     expected_data = {"id": 1, "media": {"title": "Test Movie"}}
     mock_client.get_request.return_value = expected_data
     
-    result = get_request(request_id=1)
+    result = await get_request(request_id=1)
     
-    assert result == expected_data
-    mock_client.get_request.assert_called_once_with(request_id=1)
+    assert json.loads(result) == expected_data
+    mock_client.get_request.assert_awaited_once_with(request_id=1)
 
-def test_raw_request_success(mock_client):
+@pytest.mark.asyncio
+async def test_raw_request_success(mock_client):
     expected_data = {"foo": "bar"}
     mock_client.request.return_value = expected_data
     
-    result = raw_request(method="GET", endpoint="/status", params={"a": "b"})
+    result = await raw_request(method="GET", endpoint="/status", params={"a": "b"})
     
-    assert result == expected_data
-    mock_client.request.assert_called_once_with(method="GET", endpoint="/status", params={"a": "b"}, json=None)
+    assert json.loads(result) == expected_data
+    mock_client.request.assert_awaited_once_with(method="GET", endpoint="/status", params={"a": "b"}, json=None, raw=True)
 
-def test_raw_request_invalid_method(mock_client):
+@pytest.mark.asyncio
+async def test_raw_request_invalid_method(mock_client):
     with pytest.raises(ValueError, match="Unsupported method"):
-        raw_request(method="PATCH", endpoint="/status")
+        await raw_request(method="PATCH", endpoint="/status")
+
+def test_ping_reports_client_stats():
+    with patch("jellyseerr_mcp.server._client") as client:
+        client.stats.return_value = {"pool": {"in_flight": 0}}
+        result = ping()
+
+    assert result["pool"] == {"in_flight": 0}
+
+@pytest.mark.asyncio
+async def test_raw_request_passes_raw_text_through(mock_client):
+    mock_client.request.return_value = '{"id": 7}'
+
+    result = await raw_request(method="POST", endpoint="request", body={"mediaId": 1})
+
+    assert result == '{"id": 7}'
+
+@pytest.mark.asyncio
+async def test_search_media_projects_fields(mock_client):
+    mock_client.search_media.return_value = {"results": [{"id": 1, "title": "Test Movie", "overview": "Long"}]}
+
+    compact = await search_media(query="Test Movie")
+    custom = await search_media(query="Test Movie", fields=["overview"])
+
+    assert json.loads(compact) == {"results": [{"id": 1, "title": "Test Movie"}]}
+    assert json.loads(custom) == {"results": [{"overview": "Long"}]}
+
+@pytest.mark.asyncio
+async def test_get_media_details_success(mock_client):
+    mock_client.get_media_details.return_value = {"id": 603, "title": "The Matrix"}
+
+    result = await get_media_details(media_id=603, media_type="movie")
+
+    assert json.loads(result) == {"id": 603, "title": "The Matrix"}
+    mock_client.get_media_details.assert_awaited_once_with(media_type="movie", media_id=603)
+
+@pytest.mark.asyncio
+async def test_request_media_bulk_summarises_results(mock_client):
+    mock_client.request_media_bulk.return_value = [
+        {"media_id": 1, "media_type": "movie", "is_4k": False, "ok": True, "request": {"id": 10}},
+        {"media_id": 2, "media_type": "movie", "is_4k": False, "ok": False, "error": "boom"},
+    ]
+
+    result = await request_media_bulk(items=[MediaRequestItem(media_id=1, media_type="movie"), MediaRequestItem(media_id=2, media_type="movie")])
+
+    assert json.loads(result)["succeeded"] == 1
+    assert json.loads(result)["failed"] == 1
+    mock_client.request_media_bulk.assert_awaited_once_with([(1, "movie", False), (2, "movie", False)], concurrency=None, progress=ANY)
+
+@pytest.mark.asyncio
+async def test_get_requests_success(mock_client):
+    expected_data = {"strategy": "by_id", "results": [{"request_id": 1, "ok": True, "request": {"id": 1}}]}
+    mock_client.get_requests.return_value = expected_data
+
+    result = await get_requests(request_ids=[1])
+
+    assert json.loads(result) == expected_data
+    mock_client.get_requests.assert_awaited_once_with([1], progress=ANY)
+
+@pytest.mark.asyncio
+async def test_raw_batch_keeps_order_and_reports_errors(mock_client):
+    mock_client.bulk_concurrency = 5
+
+    async def fake_request(method, endpoint, params=None, json=None):
+        if endpoint == "broken":
+            raise RuntimeError("Jellyseerr API error")
+        return {"endpoint": endpoint}
+
+    mock_client.request.side_effect = fake_request
+
+    result = json.loads(await raw_batch(requests=[
+        RawRequestItem(method="GET", endpoint="status"),
+        RawRequestItem(method="PATCH", endpoint="status"),
+        RawRequestItem(method="GET", endpoint="broken"),
+        RawRequestItem(method="get", endpoint="settings/main"),
+    ]))
+
+    assert [r["ok"] for r in result["results"]] == [True, False, False, True]
+    assert result["results"][0]["data"] == {"endpoint": "status"}
+    assert "Unsupported method" in result["results"][1]["error"]
+    assert result["succeeded"] == 2
+
+@pytest.mark.asyncio
+async def test_raw_batch_stop_on_error_skips_rest(mock_client):
+    mock_client.bulk_concurrency = 1
+    mock_client.request.side_effect = RuntimeError("down")
+
+    result = json.loads(await raw_batch(
+        requests=[RawRequestItem(method="GET", endpoint="a"), RawRequestItem(method="GET", endpoint="b")],
+        stop_on_error=True,
+    ))
+
+    assert result["results"][1]["skipped"] is True
+    assert mock_client.request.await_count == 1
+
+
+def test_run_streamable_http_is_stateless_by_default():
+    config = AppConfig(jellyseerr_url="http://x", jellyseerr_api_key="k")
+    with patch("jellyseerr_mcp.server.load_config", return_value=config), \
+            patch("jellyseerr_mcp.server.anyio.run") as run_loop, \
+            patch.object(mcp.settings, "stateless_http", False), \
+            patch.object(mcp.settings, "port", 8000):
+        run(transport="streamable-http", port=9001)
+        assert mcp.settings.stateless_http is True
+        assert mcp.settings.port == 9001
+    run_loop.assert_called_once_with(_serve, config, "streamable-http")
+
+
+def test_run_rejects_unknown_transport():
+    with pytest.raises(RuntimeError, match="Unsupported transport"):
+        run(transport="websocket")
+
+
+def test_run_rejects_workers_for_sse():
+    config = AppConfig(jellyseerr_url="http://x", jellyseerr_api_key="k")
+    with patch("jellyseerr_mcp.server.load_config", return_value=config), \
+            patch("jellyseerr_mcp.server.WorkerSupervisor") as supervisor:
+        with pytest.raises(RuntimeError, match="stateless streamable-http"):
+            run(transport="sse", workers=2)
+    supervisor.assert_not_called()
+
+
+def test_session_key_identifies_callers():
+    from jellyseerr_mcp.server import _session_key
+
+    def context_for(request):
+        ctx = MagicMock()
+        ctx.request_context.request = request
+        return ctx
+
+    sse_request = MagicMock(headers={}, query_params={"session_id": "abc"})
+    named_request = MagicMock(headers={"x-mcp-client-id": "agent-2", "x-forwarded-for": "10.0.0.7"}, query_params={})
+    proxied_request = MagicMock(headers={"x-forwarded-for": "10.0.0.7, 172.16.0.1"}, query_params={})
+    stateless_request = MagicMock(headers={}, query_params={})
+    stateless_request.client.host = "10.0.0.7"
+    with patch("jellyseerr_mcp.server.mcp.get_context") as get_context:
+        get_context.return_value = context_for(None)
+        assert _session_key() == "stdio"
+        get_context.return_value = context_for(sse_request)
+        assert _session_key() == "session:abc"
+        get_context.return_value = context_for(named_request)
+        assert _session_key() == "header:agent-2"
+        get_context.return_value = context_for(proxied_request)
+        assert _session_key() == "forwarded:10.0.0.7"
+        # A bare address may be a NAT or proxy shared by many agents
+        get_context.return_value = context_for(stateless_request)
+        assert _session_key() is None
+        with patch("jellyseerr_mcp.server.get_access_token", return_value=MagicMock(client_id="agent-1")):
+            assert _session_key() == "client:agent-1"
+
+
+@pytest.mark.asyncio
+async def test_raw_batch_reports_progress(mock_client):
+    mock_client.bulk_concurrency = 2
+    mock_client.request.return_value = {"ok": 1}
+    with patch("jellyseerr_mcp.server.mcp.get_context") as get_context:
+        get_context.return_value.report_progress = AsyncMock()
+        await raw_batch(requests=[RawRequestItem(method="GET", endpoint=f"request/{i}") for i in range(3)])
+
+    sent = [c.args for c in get_context.return_value.report_progress.await_args_list]
+    assert sent == [(1, 3), (2, 3), (3, 3)]
+
+
+@pytest.mark.asyncio
+async def test_progress_only_moves_forward_and_never_fails_the_tool():
+    from jellyseerr_mcp.server import _progress
+
+    report = _progress()
+    with patch("jellyseerr_mcp.server.mcp.get_context") as get_context:
+        get_context.return_value.report_progress = AsyncMock(side_effect=[None, RuntimeError("client gone")])
+        await report(2, 5)
+        await report(2, 5)
+        await report(1, 5)
+        await report(3, 5)
+
+    assert get_context.return_value.report_progress.await_count == 2
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from jellyseerr_mcp.services import ServiceRegistry
+
+
+def _fetcher(listings):
+    async def fetch(endpoint):
+        result = listings[endpoint]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_refresh_prefers_default_server_per_quality():
+    registry = ServiceRegistry()
+    await registry.refresh(_fetcher({
+        "service/radarr": [{"id": 1, "is4k": False}, {"id": 2, "is4k": False, "isDefault": True}, {"id": 3, "is4k": True}],
+        "service/sonarr": [{"id": 5, "is4k": False}],
+    }))
+
+    assert registry.resolve("movie", False) == 2
+    assert registry.resolve("movie", True) == 3
+    assert registry.resolve("tv", False) == 5
+    assert registry.resolve("tv", True) is None
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_keeps_table_on_failure():
+    registry = ServiceRegistry()
+    listings = {"service/radarr": [{"id": 1}], "service/sonarr": []}
+    await registry.refresh(_fetcher(listings))
+
+    listings["service/radarr"] = RuntimeError("down")
+    registry.start(_fetcher(listings), interval=0.01)
+    await asyncio.sleep(0.05)
+    await registry.stop()
+
+    assert registry.resolve("movie", False) == 1
+    assert registry.failures >= 1
+
+
+@pytest.mark.asyncio
+async def test_start_loads_in_the_background():
+    registry = ServiceRegistry()
+    release = asyncio.Event()
+    listings = {"service/radarr": [{"id": 1}], "service/sonarr": []}
+
+    async def hanging(endpoint):
+        await release.wait()
+        return listings[endpoint]
+
+    # Returns at once even though the upstream hasn't answered yet
+    registry.start(hanging, interval=0)
+    assert registry.resolve("movie", False) is None
+
+    release.set()
+    await registry._task
+    assert registry.resolve("movie", False) == 1
+    assert registry.refreshes == 1
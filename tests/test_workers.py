@@ -0,0 +1,59 @@
+import os
+import time
+
+import pytest
+
+from jellyseerr_mcp.workers import HAS_REUSEPORT, WorkerSupervisor, listen_socket
+
+
+def _exit_immediately(slot):
+    os._exit(3)
+
+
+def _sleep_forever(slot):
+    time.sleep(60)
+
+
+@pytest.mark.skipif(not HAS_REUSEPORT, reason="SO_REUSEPORT not available")
+def test_workers_can_bind_the_same_port():
+    first = listen_socket("127.0.0.1", 0)
+    port = first.getsockname()[1]
+    second = listen_socket("127.0.0.1", port)
+    try:
+        assert second.getsockname()[1] == port
+    finally:
+        first.close()
+        second.close()
+
+
+def test_port_in_use_without_reuse_port_fails():
+    first = listen_socket("127.0.0.1", 0, reuse_port=False)
+    try:
+        with pytest.raises(OSError):
+            listen_socket("127.0.0.1", first.getsockname()[1], reuse_port=False)
+    finally:
+        first.close()
+
+
+def test_crashed_worker_is_restarted_with_backoff():
+    supervisor = WorkerSupervisor(_exit_immediately, workers=1, min_uptime=60, max_backoff=4)
+    supervisor.start()
+    try:
+        supervisor.tick(timeout=5)
+        assert supervisor.restarts == 1
+        assert supervisor.alive == 0
+        # Died right after starting, so the restart waits instead of forking again at once
+        assert supervisor._backoff[0] == 1.0
+    finally:
+        supervisor.stop()
+
+
+def test_stop_terminates_workers():
+    supervisor = WorkerSupervisor(_sleep_forever, workers=2)
+    supervisor.start()
+    assert supervisor.alive == 2
+
+    supervisor.stop(timeout=5)
+
+    assert supervisor.alive == 0
+    assert supervisor.restarts == 0